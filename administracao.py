@@ -0,0 +1,134 @@
+import streamlit as st
+import pandas as pd
+from manutencao import MaintenanceManager, ManutencaoEmExecucao
+
+# Inicializar o gerenciador de manutenção
+manutencao = MaintenanceManager()
+
+# Título da página
+st.markdown("# 🛠️ Administração do Banco")
+st.markdown("*Manutenção automática, estado do arquivo e planos de consulta*")
+st.markdown("---")
+
+# Estado atual do arquivo
+stats = manutencao.estatisticas_arquivo()
+
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric("Tamanho do Arquivo", f"{stats['tamanho_bytes'] / 1024 ** 2:.2f} MB")
+
+with col2:
+    st.metric("Páginas Livres", f"{stats['paginas_livres']} ({stats['fracao_livre']:.1%})")
+
+with col3:
+    st.metric("Modo de Journal", stats['journal_mode'].upper())
+
+with col4:
+    st.metric("Manutenção Agendada", "Ativa" if manutencao.agendamento_ativo() else "Parada")
+
+inicio, fim = manutencao.janela
+st.caption(
+    f"Janela de baixo uso: {inicio:02d}h às {fim:02d}h, após {manutencao.minutos_ocioso} minutos "
+    f"sem alterações · Vacuum incremental: {'ativo' if stats['vacuum_incremental'] else 'inativo'}"
+)
+
+erro_agendado = manutencao.ultimo_erro()
+if erro_agendado is not None:
+    quando, mensagem = erro_agendado
+    st.error(f"❌ Falha na manutenção agendada em {quando.strftime('%d/%m/%Y %H:%M')}: {mensagem}")
+
+# Última execução
+st.subheader("🕒 Última Manutenção")
+ultima = manutencao.ultima_execucao()
+
+if ultima is None:
+    st.info("ℹ️ Nenhuma manutenção executada ainda.")
+else:
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Executada em", pd.to_datetime(ultima['executado_em']).strftime('%d/%m/%Y %H:%M'))
+    col2.metric("Duração", f"{ultima['duracao_s']:.2f} s")
+    col3.metric("Integridade", "OK" if ultima['integridade'] == 'ok' else "Falha")
+
+    if ultima['integridade'] != 'ok':
+        st.error(f"❌ Problemas de integridade: {ultima['integridade']}")
+
+    for mensagem in ultima['mensagens'] or []:
+        st.warning(f"⚠️ {mensagem}")
+
+# Ações manuais
+st.markdown("---")
+st.subheader("▶️ Executar Agora")
+
+col1, col2 = st.columns(2)
+
+with col1:
+    verificacao_completa = st.checkbox("Verificação de integridade completa (mais lenta)")
+    if manutencao.em_execucao():
+        st.info("⏳ Manutenção em execução")
+    if st.button("🧹 Executar manutenção", type="primary"):
+        try:
+            with st.spinner("Executando manutenção..."):
+                execucao = manutencao.executar_manutencao(verificacao_completa)
+            st.success(f"✅ Manutenção concluída em {execucao['duracao_s']:.2f} s")
+            st.rerun()
+        except ManutencaoEmExecucao:
+            st.info("⏳ Manutenção em execução: aguarde a conclusão e tente novamente")
+        except Exception as e:
+            st.error(f"❌ Erro na manutenção: {e}")
+
+with col2:
+    if not stats['vacuum_incremental']:
+        st.markdown("O vacuum incremental devolve páginas livres ao sistema aos poucos, a cada manutenção.")
+        if st.button("⚙️ Habilitar vacuum incremental"):
+            if st.session_state.get('confirm_vacuum'):
+                try:
+                    with st.spinner("Executando VACUUM..."):
+                        manutencao.habilitar_vacuum_incremental()
+                    del st.session_state.confirm_vacuum
+                    st.success("✅ Vacuum incremental habilitado")
+                    st.rerun()
+                except ManutencaoEmExecucao:
+                    st.info("⏳ Manutenção em execução: aguarde a conclusão e tente novamente")
+                except Exception as e:
+                    st.error(f"❌ Erro ao habilitar vacuum incremental: {e}")
+            else:
+                st.session_state.confirm_vacuum = True
+                st.warning("⚠️ Requer um VACUUM completo, que bloqueia o banco. Clique novamente para confirmar")
+
+# Histórico
+historico = manutencao.listar_historico()
+
+if not historico.empty:
+    st.markdown("---")
+    st.subheader("📈 Histórico")
+
+    historico['executado_em'] = pd.to_datetime(historico['executado_em'])
+    evolucao = historico.set_index('executado_em').sort_index()
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**Tamanho do arquivo (MB)**")
+        st.line_chart(evolucao['tamanho_bytes'] / 1024 ** 2)
+
+    with col2:
+        st.markdown("**Páginas livres**")
+        st.line_chart(evolucao['paginas_livres'])
+
+    df_display = historico[[
+        'executado_em', 'duracao_s', 'tamanho_bytes', 'paginas', 'paginas_livres',
+        'paginas_liberadas', 'integridade', 'planos_alterados'
+    ]].copy()
+    df_display['executado_em'] = df_display['executado_em'].dt.strftime('%d/%m/%Y %H:%M')
+    df_display.columns = [
+        'Executada em', 'Duração (s)', 'Tamanho (bytes)', 'Páginas', 'Páginas Livres',
+        'Páginas Liberadas', 'Integridade', 'Planos Alterados'
+    ]
+    st.dataframe(df_display, use_container_width=True, hide_index=True)
+
+# Planos de execução das consultas monitoradas
+with st.expander("🔎 Planos de Consulta Atuais"):
+    for nome, plano in manutencao.capturar_planos().items():
+        st.markdown(f"**{nome}**")
+        st.code(plano, language=None)
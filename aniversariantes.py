@@ -0,0 +1,95 @@
+import streamlit as st
+import pandas as pd
+from database import DatabaseManager
+from datetime import date, timedelta
+import calendar
+
+# Inicializar o gerenciador de banco de dados
+db = DatabaseManager()
+
+def ano_da_ocorrencia(df, inicio):
+    """Ano em que cada dia/mês cai dentro do período (trata a virada do ano)"""
+    chave_inicio = inicio.month * 100 + inicio.day
+    return (df['mes_dia'] < chave_inicio).astype(int) + inicio.year
+
+# Título da página
+st.markdown("# 🎂 Aniversariantes")
+st.markdown("*Aniversários de nascimento e de tempo de casa*")
+st.markdown("---")
+
+# Seleção do período
+hoje = date.today()
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    periodo = st.selectbox(
+        "📅 Período:",
+        ["Este mês", "Esta semana", "Hoje", "Próximos 30 dias", "Personalizado"]
+    )
+
+if periodo == "Hoje":
+    inicio, fim = hoje, hoje
+elif periodo == "Esta semana":
+    inicio = hoje - timedelta(days=hoje.weekday())
+    fim = inicio + timedelta(days=6)
+elif periodo == "Próximos 30 dias":
+    inicio, fim = hoje, hoje + timedelta(days=30)
+elif periodo == "Personalizado":
+    with col2:
+        inicio = st.date_input("De", value=hoje, format="DD/MM/YYYY")
+    with col3:
+        fim = st.date_input("Até", value=hoje + timedelta(days=7), format="DD/MM/YYYY")
+else:
+    inicio = hoje.replace(day=1)
+    fim = hoje.replace(day=calendar.monthrange(hoje.year, hoje.month)[1])
+
+if fim < inicio:
+    st.error("❌ A data final deve ser posterior à data inicial")
+    st.stop()
+
+st.caption(f"Período: {inicio.strftime('%d/%m/%Y')} a {fim.strftime('%d/%m/%Y')}")
+
+tab1, tab2 = st.tabs(["🎂 Aniversários", "🏆 Tempo de Casa"])
+
+with tab1:
+    df = db.listar_aniversariantes(inicio, fim)
+
+    if df.empty:
+        st.info("ℹ️ Nenhum aniversariante no período.")
+    else:
+        nascimento = pd.to_datetime(df['data_nascimento'], errors='coerce')
+        df_display = pd.DataFrame({
+            'Dia': nascimento.dt.strftime('%d/%m'),
+            'Nome Completo': df['nome_completo'],
+            'Cargo': df['cargo'],
+            'Cidade': df['cidade'],
+            'UF': df['estado'],
+            'Idade': ano_da_ocorrencia(df, inicio) - nascimento.dt.year
+        })
+
+        st.metric("Aniversariantes no Período", len(df_display))
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
+
+with tab2:
+    df = db.listar_aniversarios_cadastro(inicio, fim)
+
+    if not df.empty:
+        cadastro = pd.to_datetime(df['data_cadastro'], errors='coerce')
+        df['anos_de_casa'] = ano_da_ocorrencia(df, inicio) - cadastro.dt.year
+        # Quem foi cadastrado no próprio período ainda não completa aniversário
+        df = df[df['anos_de_casa'] > 0]
+        cadastro = cadastro.loc[df.index]
+
+    if df.empty:
+        st.info("ℹ️ Nenhum aniversário de tempo de casa no período.")
+    else:
+        df_display = pd.DataFrame({
+            'Dia': cadastro.dt.strftime('%d/%m'),
+            'Nome Completo': df['nome_completo'],
+            'Cargo': df['cargo'],
+            'Cadastrado em': cadastro.dt.strftime('%d/%m/%Y'),
+            'Anos de Casa': df['anos_de_casa']
+        })
+
+        st.metric("Aniversários de Casa no Período", len(df_display))
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
@@ -0,0 +1,348 @@
+import argparse
+import asyncio
+import gzip
+import json
+import re
+import sqlite3
+from datetime import date
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from database import ConnectionPool, DatabaseManager
+
+CAMPOS = [
+    'nome_completo', 'endereco', 'bairro', 'cidade', 'estado',
+    'cep', 'telefone', 'data_nascimento', 'cargo'
+]
+
+ESTADOS_BRASIL = [
+    "AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG",
+    "PA", "PB", "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO"
+]
+
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 500
+TAMANHO_MAXIMO_LOTE = 1000
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+MAXIMO_CABECALHOS = 100
+# Maior inteiro aceito pelo SQLite (64 bits com sinal)
+MAIOR_INTEIRO = 2 ** 63 - 1
+# Respostas menores que isso não compensam a compressão
+TAMANHO_MINIMO_GZIP = 1024
+
+ROTAS = [
+    ('GET', re.compile(r'^/colaboradores$'), 'listar'),
+    ('POST', re.compile(r'^/colaboradores$'), 'criar'),
+    ('POST', re.compile(r'^/colaboradores/lote$'), 'criar_lote'),
+    ('GET', re.compile(r'^/colaboradores/(\d+)$'), 'obter'),
+    ('PUT', re.compile(r'^/colaboradores/(\d+)$'), 'atualizar'),
+    ('DELETE', re.compile(r'^/colaboradores/(\d+)$'), 'excluir'),
+    ('GET', re.compile(r'^/estatisticas$'), 'estatisticas'),
+]
+
+class ErroHTTP(Exception):
+    def __init__(self, status, mensagem, headers=None):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+        self.headers = headers or {}
+
+def validar_cep(cep):
+    """Valida formato do CEP"""
+    return re.match(r'^\d{5}-?\d{3}$', cep) is not None
+
+def validar_telefone(telefone):
+    """Valida formato do telefone"""
+    telefone_limpo = re.sub(r'[^\d]', '', telefone)
+    return len(telefone_limpo) >= 10
+
+def validar_dados(corpo):
+    """Valida um colaborador recebido em JSON e retorna a tupla usada pelo DatabaseManager"""
+    if not isinstance(corpo, dict):
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, "O corpo deve ser um objeto JSON")
+
+    erros = []
+    desconhecidos = sorted(set(corpo) - set(CAMPOS))
+    if desconhecidos:
+        erros.append(f"Campos desconhecidos: {', '.join(desconhecidos)}")
+
+    valores = {}
+    for campo in CAMPOS:
+        valor = corpo.get(campo)
+        if valor is not None and not isinstance(valor, str):
+            erros.append(f"{campo} deve ser texto")
+            valor = None
+        valores[campo] = valor.strip() if valor and valor.strip() else None
+
+    if not valores['nome_completo']:
+        erros.append("Nome completo é obrigatório")
+    if valores['cep'] and not validar_cep(valores['cep']):
+        erros.append("CEP deve ter o formato 12345-678")
+    if valores['telefone'] and not validar_telefone(valores['telefone']):
+        erros.append("Telefone deve ter pelo menos 10 dígitos")
+    if valores['estado'] and valores['estado'] not in ESTADOS_BRASIL:
+        erros.append("Estado deve ser uma UF válida")
+
+    if valores['data_nascimento']:
+        try:
+            nascimento = date.fromisoformat(valores['data_nascimento'])
+            if not date(1900, 1, 1) <= nascimento <= date.today():
+                erros.append("Data de nascimento deve estar entre 1900 e a data atual")
+            valores['data_nascimento'] = nascimento
+        except ValueError:
+            erros.append("Data de nascimento deve ter o formato AAAA-MM-DD")
+
+    if erros:
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, "; ".join(erros))
+
+    return tuple(valores[campo] for campo in CAMPOS)
+
+def _registros(df):
+    """Converte um DataFrame em lista de dicionários serializáveis (nulos como None)"""
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict('records')
+
+def _inteiro(query, nome, padrao=None):
+    valor = query.get(nome, [None])[0]
+    if valor is None or valor == '':
+        return padrao
+    try:
+        valor = int(valor)
+    except ValueError:
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Parâmetro {nome} deve ser um número inteiro")
+    if abs(valor) > MAIOR_INTEIRO:
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Parâmetro {nome} fora do intervalo permitido")
+    return valor
+
+def _id(valor):
+    """Converte o ID da rota; IDs além do limite do SQLite não podem existir"""
+    id_colaborador = int(valor)
+    if id_colaborador > MAIOR_INTEIRO:
+        raise ErroHTTP(HTTPStatus.NOT_FOUND, "Colaborador não encontrado")
+    return id_colaborador
+
+class ColaboradoresAPI:
+    def __init__(self, db):
+        self.db = db
+        # Estatísticas da última versão dos dados já calculada
+        self._estatisticas = (None, None)
+
+    async def _executar(self, funcao, *args):
+        """Roda uma chamada ao banco em thread, sem bloquear o loop de eventos"""
+        return await asyncio.to_thread(funcao, *args)
+
+    async def listar(self, query, corpo):
+        limite = _inteiro(query, 'limite', LIMITE_PADRAO)
+        if not 1 <= limite <= LIMITE_MAXIMO:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Parâmetro limite deve estar entre 1 e {LIMITE_MAXIMO}")
+
+        filtros = {nome: query[nome][0] for nome in ('nome', 'cargo', 'estado', 'cidade') if nome in query}
+        df, proximo = await self._executar(
+            self.db.listar_colaboradores_pagina, filtros, _inteiro(query, 'cursor'), limite
+        )
+        return HTTPStatus.OK, {'dados': _registros(df), 'proximo_cursor': proximo}
+
+    async def criar(self, query, corpo):
+        dados = validar_dados(corpo)
+        id_colaborador = await self._executar(self.db.inserir_colaborador, dados)
+        return HTTPStatus.CREATED, {'id': id_colaborador}
+
+    async def criar_lote(self, query, corpo):
+        if not isinstance(corpo, list) or not corpo:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "O corpo deve ser uma lista JSON não vazia")
+        if len(corpo) > TAMANHO_MAXIMO_LOTE:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"O lote pode ter no máximo {TAMANHO_MAXIMO_LOTE} colaboradores")
+
+        # Valida o lote inteiro antes de gravar: ou entram todos, ou nenhum
+        lista_dados, erros = [], []
+        for indice, item in enumerate(corpo):
+            try:
+                lista_dados.append(validar_dados(item))
+            except ErroHTTP as e:
+                erros.append(f"Item {indice}: {e.mensagem}")
+        if erros:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, " | ".join(erros))
+
+        ids = await self._executar(self.db.inserir_colaboradores, lista_dados)
+        return HTTPStatus.CREATED, {'ids': ids}
+
+    async def obter(self, query, corpo, id_colaborador):
+        colaborador = await self._executar(self.db.buscar_colaborador_por_id, _id(id_colaborador))
+        if colaborador is None:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, "Colaborador não encontrado")
+        return HTTPStatus.OK, dict(zip(['id'] + CAMPOS + ['data_cadastro'], colaborador))
+
+    async def atualizar(self, query, corpo, id_colaborador):
+        dados = validar_dados(corpo)
+        if not await self._executar(self.db.atualizar_colaborador, _id(id_colaborador), dados):
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, "Colaborador não encontrado")
+        return HTTPStatus.OK, {'id': _id(id_colaborador)}
+
+    async def excluir(self, query, corpo, id_colaborador):
+        if not await self._executar(self.db.excluir_colaborador, _id(id_colaborador)):
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, "Colaborador não encontrado")
+        return HTTPStatus.NO_CONTENT, None
+
+    async def estatisticas(self, query, corpo, versao=None):
+        versao_cache, stats = self._estatisticas
+        if versao is None or versao != versao_cache:
+            stats = await self._executar(self.db.obter_estatisticas)
+            self._estatisticas = (versao, stats)
+        return HTTPStatus.OK, stats
+
+    async def despachar(self, metodo, alvo, headers, corpo):
+        """Resolve a rota e retorna (status, payload, headers adicionais)"""
+        url = urlsplit(alvo)
+        query = parse_qs(url.query)
+        permitidos = []
+
+        for metodo_rota, padrao, nome in ROTAS:
+            encontrado = padrao.match(url.path)
+            if not encontrado:
+                continue
+            if metodo_rota != metodo:
+                permitidos.append(metodo_rota)
+                continue
+
+            if corpo:
+                try:
+                    corpo = json.loads(corpo)
+                except ValueError:
+                    raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Corpo JSON inválido")
+
+            if metodo != 'GET':
+                status, payload = await getattr(self, nome)(query, corpo, *encontrado.groups())
+                return status, payload, {}
+
+            # Leituras: identidade do banco + versão dos dados formam a ETag, conferida
+            # antes da consulta (a identidade muda quando um backup é restaurado)
+            versao = await self._executar(self.db.obter_versao_completa)
+            etag = f'W/"{versao[0][:12]}-{versao[1]}"'
+            enviadas = [tag.strip() for tag in headers.get('if-none-match', '').split(',')]
+            if etag in enviadas:
+                return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag}
+
+            if nome == 'estatisticas':
+                status, payload = await self.estatisticas(query, corpo, versao)
+            else:
+                status, payload = await getattr(self, nome)(query, corpo, *encontrado.groups())
+            # "*" só casa se o recurso existe, ou seja, depois que a consulta o encontrou
+            if '*' in enviadas and status == HTTPStatus.OK:
+                return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag}
+            return status, payload, {'ETag': etag}
+
+        if permitidos:
+            raise ErroHTTP(
+                HTTPStatus.METHOD_NOT_ALLOWED, f"Métodos permitidos: {', '.join(permitidos)}",
+                {'Allow': ', '.join(permitidos)}
+            )
+        raise ErroHTTP(HTTPStatus.NOT_FOUND, "Rota não encontrada")
+
+    async def _responder(self, writer, status, payload, headers, extras, manter_conexao):
+        corpo = b''
+        if payload is not None:
+            corpo = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+
+        resposta = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Vary': 'Accept-Encoding',
+            'Connection': 'keep-alive' if manter_conexao else 'close',
+        }
+        resposta.update(extras)
+
+        if len(corpo) >= TAMANHO_MINIMO_GZIP and 'gzip' in headers.get('accept-encoding', ''):
+            corpo = gzip.compress(corpo, compresslevel=6)
+            resposta['Content-Encoding'] = 'gzip'
+        resposta['Content-Length'] = str(len(corpo))
+
+        linhas = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        linhas += [f"{nome}: {valor}" for nome, valor in resposta.items()]
+        writer.write(("\r\n".join(linhas) + "\r\n\r\n").encode('latin-1') + corpo)
+        await writer.drain()
+
+    async def atender(self, reader, writer):
+        """Atende uma conexão HTTP/1.1, com suporte a keep-alive"""
+        try:
+            while True:
+                headers = {}
+                try:
+                    linha = await reader.readline()
+                    if not linha:
+                        break
+
+                    while True:
+                        cabecalho = await reader.readline()
+                        if cabecalho in (b'\r\n', b'\n', b''):
+                            break
+                        if len(headers) >= MAXIMO_CABECALHOS:
+                            raise ValueError("Cabeçalhos demais")
+                        nome, _, valor = cabecalho.decode('latin-1').partition(':')
+                        headers[nome.strip().lower()] = valor.strip()
+
+                    metodo, alvo, versao_http = linha.decode('latin-1').split()
+                    tamanho = int(headers.get('content-length') or 0)
+                    if tamanho < 0:
+                        raise ValueError("Content-Length negativo")
+                except ValueError:
+                    # Inclui linhas maiores que o limite do StreamReader (64 KiB)
+                    erro = {'erro': "Requisição inválida"}
+                    await self._responder(writer, HTTPStatus.BAD_REQUEST, erro, headers, {}, False)
+                    break
+
+                manter_conexao = versao_http == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+                try:
+                    if tamanho > TAMANHO_MAXIMO_CORPO:
+                        manter_conexao = False
+                        raise ErroHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo da requisição muito grande")
+
+                    corpo = await reader.readexactly(tamanho) if tamanho else b''
+                    status, payload, extras = await self.despachar(metodo.upper(), alvo, headers, corpo)
+                except ErroHTTP as e:
+                    status, payload, extras = e.status, {'erro': e.mensagem}, e.headers
+                except sqlite3.OperationalError as e:
+                    status, payload, extras = HTTPStatus.SERVICE_UNAVAILABLE, {'erro': f"Banco indisponível: {e}"}, {}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    status, payload, extras = HTTPStatus.INTERNAL_SERVER_ERROR, {'erro': f"Erro interno: {e}"}, {}
+
+                await self._responder(writer, status, payload, headers, extras, manter_conexao)
+                if not manter_conexao:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def servir(host, porta, db_name, tamanho_pool):
+    pool = ConnectionPool(db_name, tamanho_pool)
+    api = ColaboradoresAPI(DatabaseManager(db_name, pool=pool))
+    servidor = await asyncio.start_server(api.atender, host, porta)
+    print(f"API disponível em http://{host}:{porta}")
+
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        pool.fechar()
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON do cadastro de colaboradores")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8000, help="Porta de escuta (padrão: 8000)")
+    parser.add_argument("--db", default="colaboradores.db", help="Arquivo do banco SQLite")
+    parser.add_argument("--pool", type=int, default=5, help="Conexões no pool (padrão: 5)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(servir(args.host, args.porta, args.db, args.pool))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from database import DatabaseManager
+
+class ErroBackup(Exception):
+    pass
+
+def _sha256(caminho):
+    hash_arquivo = hashlib.sha256()
+    with open(caminho, 'rb') as arq:
+        for bloco in iter(lambda: arq.read(1024 * 1024), b''):
+            hash_arquivo.update(bloco)
+    return hash_arquivo.hexdigest()
+
+def _verificar_integridade(caminho):
+    conn = sqlite3.connect(caminho)
+    resultado = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    conn.close()
+    if resultado != ['ok']:
+        raise ErroBackup(f"Falha na verificação de integridade de {caminho}: {'; '.join(resultado[:5])}")
+
+class BackupManager:
+    def __init__(self, db_name="colaboradores.db", pasta="backups", paginas_por_passo=100, pausa=0.01):
+        self.db_name = db_name
+        self.pasta = pasta
+        # Cada passo copia poucas páginas e libera o banco por `pausa` segundos,
+        # para que as gravações do Streamlit não fiquem esperando o backup
+        self.paginas_por_passo = paginas_por_passo
+        self.pausa = pausa
+        self.max_reinicios = 20
+        self.prefixo = os.path.splitext(os.path.basename(db_name))[0]
+        self._padrao_arquivo = re.compile(rf'^{re.escape(self.prefixo)}_\d{{8}}_\d{{6}}_\d{{3}}\.db(\.gz)?$')
+
+        self.ultimo_backup = None
+        self.ultimo_erro = None
+        self._parar = None
+        self._thread = None
+
+    def _copiar(self, origem, destino, paginas):
+        """Copia um banco para outro com a API de backup online e retorna as métricas"""
+        metricas = {'passos': 0, 'reinicios': 0, 'pausa_maxima_ms': 0.0, 'pausa_total_ms': 0.0}
+        estado = {'fim_passo': time.perf_counter(), 'restantes': None}
+
+        def progresso(status, restantes, total):
+            # Tempo do passo = período em que o banco de origem ficou bloqueado
+            passo_ms = (time.perf_counter() - estado['fim_passo']) * 1000
+            metricas['passos'] += 1
+            metricas['pausa_total_ms'] += passo_ms
+            metricas['pausa_maxima_ms'] = max(metricas['pausa_maxima_ms'], passo_ms)
+            metricas['paginas'] = total
+
+            # Uma gravação de outra conexão durante a cópia faz o SQLite recomeçar
+            if estado['restantes'] is not None and restantes > estado['restantes']:
+                metricas['reinicios'] += 1
+                if metricas['reinicios'] > self.max_reinicios:
+                    raise ErroBackup("Backup reiniciado vezes demais por gravações concorrentes")
+            estado['restantes'] = restantes
+
+            if restantes and self.pausa:
+                time.sleep(self.pausa)
+            estado['fim_passo'] = time.perf_counter()
+
+        inicio = time.perf_counter()
+        origem.backup(destino, pages=paginas, progress=progresso)
+        duracao = time.perf_counter() - inicio
+
+        tamanho_pagina = origem.execute("PRAGMA page_size").fetchone()[0]
+        paginas_copiadas = metricas.get('paginas', 0)
+        metricas.update({
+            'paginas': paginas_copiadas,
+            'duracao_s': round(duracao, 3),
+            'paginas_por_segundo': round(paginas_copiadas / duracao, 1) if duracao else None,
+            'mb_por_segundo': round(paginas_copiadas * tamanho_pagina / duracao / 1024 ** 2, 2) if duracao else None,
+            'pausa_maxima_ms': round(metricas['pausa_maxima_ms'], 2),
+            'pausa_media_ms': round(metricas['pausa_total_ms'] / metricas['passos'], 2) if metricas['passos'] else 0.0
+        })
+        del metricas['pausa_total_ms']
+        return metricas
+
+    def _ativar_wal(self, conn, timeout=30):
+        """Coloca o banco em modo WAL.
+
+        A troca exige acesso exclusivo e não espera pelo timeout da conexão: com
+        gravações em andamento, tenta de novo até o banco ficar livre.
+        """
+        limite = time.monotonic() + timeout
+        while True:
+            try:
+                if conn.execute("PRAGMA journal_mode=WAL").fetchone()[0] == 'wal':
+                    return
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e):
+                    raise
+            if time.monotonic() > limite:
+                raise ErroBackup("Não foi possível colocar o banco em modo WAL: banco ocupado")
+            time.sleep(0.01)
+
+    def _caminho_metadados(self, caminho):
+        return caminho + ".json"
+
+    @contextmanager
+    def _arquivo_sqlite(self, caminho, copia=False):
+        """Entrega o caminho de um arquivo SQLite, descomprimindo backups .gz em arquivo temporário.
+
+        Com `copia`, backups não comprimidos também são copiados, para que possam ser alterados.
+        """
+        if not caminho.endswith('.gz') and not copia:
+            yield caminho
+            return
+
+        abrir = gzip.open if caminho.endswith('.gz') else open
+        descritor, temporario = tempfile.mkstemp(suffix='.db', dir=os.path.dirname(caminho) or None)
+        try:
+            with os.fdopen(descritor, 'wb') as destino, abrir(caminho, 'rb') as origem:
+                shutil.copyfileobj(origem, destino, 1024 * 1024)
+            yield temporario
+        finally:
+            os.remove(temporario)
+
+    def criar_backup(self, comprimir=False):
+        """Cria um backup online do banco e retorna os metadados com as métricas"""
+        os.makedirs(self.pasta, exist_ok=True)
+        carimbo = datetime.now()
+        nome = f"{self.prefixo}_{carimbo.strftime('%Y%m%d_%H%M%S_%f')[:-3]}.db"
+        caminho = os.path.join(self.pasta, nome + (".gz" if comprimir else ""))
+        temporario = os.path.join(self.pasta, nome + ".tmp")
+
+        try:
+            origem = sqlite3.connect(self.db_name, timeout=30)
+            destino = sqlite3.connect(temporario)
+            try:
+                # Em WAL, uma transação de leitura aberta durante toda a cópia fixa
+                # um snapshot: as gravações continuam e o backup não recomeça
+                self._ativar_wal(origem)
+                origem.execute("BEGIN")
+                origem.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                metricas = self._copiar(origem, destino, self.paginas_por_passo)
+                origem.rollback()
+            finally:
+                destino.close()
+                origem.close()
+
+            _verificar_integridade(temporario)
+
+            if comprimir:
+                with open(temporario, 'rb') as arq_origem, gzip.open(caminho, 'wb', compresslevel=6) as arq_destino:
+                    shutil.copyfileobj(arq_origem, arq_destino, 1024 * 1024)
+                os.remove(temporario)
+            else:
+                os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+        metadados = {
+            'arquivo': os.path.basename(caminho),
+            'criado_em': carimbo.isoformat(timespec='seconds'),
+            'comprimido': comprimir,
+            'tamanho_bytes': os.path.getsize(caminho),
+            'sha256': _sha256(caminho),
+            **metricas
+        }
+        with open(self._caminho_metadados(caminho), 'w', encoding='utf-8') as arq:
+            json.dump(metadados, arq, ensure_ascii=False, indent=2)
+
+        self.ultimo_backup = metadados
+        return metadados
+
+    def listar_backups(self):
+        """Lista os backups da pasta, do mais recente para o mais antigo"""
+        if not os.path.isdir(self.pasta):
+            return []
+
+        backups = []
+        for arquivo in sorted(os.listdir(self.pasta), reverse=True):
+            if not self._padrao_arquivo.match(arquivo):
+                continue
+            caminho_metadados = self._caminho_metadados(os.path.join(self.pasta, arquivo))
+            metadados = {'arquivo': arquivo}
+            if os.path.exists(caminho_metadados):
+                with open(caminho_metadados, encoding='utf-8') as arq:
+                    metadados = json.load(arq)
+            backups.append(metadados)
+        return backups
+
+    def aplicar_retencao(self, manter=7):
+        """Remove os backups mais antigos, mantendo os `manter` mais recentes"""
+        removidos = []
+        for metadados in self.listar_backups()[manter:]:
+            caminho = os.path.join(self.pasta, metadados['arquivo'])
+            for arquivo in (caminho, self._caminho_metadados(caminho)):
+                if os.path.exists(arquivo):
+                    os.remove(arquivo)
+            removidos.append(metadados['arquivo'])
+        return removidos
+
+    def verificar_backup(self, caminho):
+        """Confere o hash e a integridade de um backup; lança ErroBackup se houver falha"""
+        if not os.path.exists(caminho):
+            raise ErroBackup(f"Backup não encontrado: {caminho}")
+
+        metadados = {}
+        if os.path.exists(self._caminho_metadados(caminho)):
+            with open(self._caminho_metadados(caminho), encoding='utf-8') as arq:
+                metadados = json.load(arq)
+            if metadados.get('sha256') and metadados['sha256'] != _sha256(caminho):
+                raise ErroBackup(f"Hash de {caminho} não confere com o registrado no backup")
+
+        try:
+            with self._arquivo_sqlite(caminho) as arquivo:
+                _verificar_integridade(arquivo)
+        except (OSError, EOFError, sqlite3.DatabaseError) as e:
+            raise ErroBackup(f"Backup ilegível: {caminho}: {e}")
+        return metadados
+
+    def restaurar_backup(self, caminho, backup_seguranca=True):
+        """Restaura um backup sobre o banco atual; por padrão salva antes o estado atual"""
+        self.verificar_backup(caminho)
+
+        seguranca = self.criar_backup() if backup_seguranca else None
+
+        with self._arquivo_sqlite(caminho, copia=True) as arquivo:
+            identidade = self._preparar_restauracao(arquivo)
+            origem = sqlite3.connect(arquivo)
+            destino = sqlite3.connect(self.db_name, timeout=30)
+            try:
+                # Restauração em um único passo, para que nenhum leitor veja o banco pela metade
+                metricas = self._copiar(origem, destino, -1)
+            finally:
+                destino.close()
+                origem.close()
+
+        # O snapshot analítico é de outra linha do tempo; a nova identidade já o
+        # invalida, mas o arquivo local é removido para liberar espaço
+        snapshot = os.path.splitext(self.db_name)[0] + ".parquet"
+        if os.path.isdir(snapshot):
+            shutil.rmtree(snapshot)
+        elif os.path.exists(snapshot):
+            os.remove(snapshot)
+
+        self._conferir_restauracao(identidade)
+        return {'restaurado': os.path.basename(caminho), 'backup_seguranca': seguranca, **metricas}
+
+    def _preparar_restauracao(self, arquivo):
+        """Ajusta a cópia do backup antes de restaurá-la e retorna sua nova identidade.
+
+        A versão dos dados do backup é anterior à do banco atual; se fosse restaurada
+        como está, números de versão já usados voltariam com outros dados (ETags da
+        API e o snapshot dos relatórios dependem de a versão só crescer). A cópia
+        recebe uma versão acima das duas e uma nova identidade.
+        """
+        versao_atual = DatabaseManager(self.db_name).obter_versao_dados()
+        # Garante tabelas e triggers atuais também em backups de versões antigas do sistema
+        versao_backup = DatabaseManager(arquivo).obter_versao_dados()
+
+        conn = sqlite3.connect(arquivo)
+        conn.execute("DELETE FROM colaboradores_alteracoes")
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = 'colaboradores_alteracoes'")
+        conn.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES ('colaboradores_alteracoes', ?)",
+            (max(versao_atual, versao_backup) + 1,)
+        )
+        conn.execute("UPDATE sistema SET valor = lower(hex(randomblob(16))) WHERE chave = 'identidade'")
+        identidade = conn.execute("SELECT valor FROM sistema WHERE chave = 'identidade'").fetchone()[0]
+        conn.commit()
+        conn.close()
+        return identidade
+
+    def _conferir_restauracao(self, identidade):
+        """Confere se o banco restaurado está íntegro e é de fato a cópia preparada"""
+        _verificar_integridade(self.db_name)
+        if DatabaseManager(self.db_name).obter_identidade() != identidade:
+            raise ErroBackup("O banco restaurado não corresponde ao backup preparado")
+
+    def _executar_agendamento(self, parar, intervalo, manter, comprimir):
+        while not parar.is_set():
+            try:
+                metadados = self.criar_backup(comprimir)
+                self.aplicar_retencao(manter)
+                self.ultimo_erro = None
+                print(f"Backup criado: {metadados['arquivo']} ({metadados['duracao_s']} s, "
+                      f"pausa máxima {metadados['pausa_maxima_ms']} ms)")
+            except Exception as e:
+                self.ultimo_erro = str(e)
+                print(f"❌ Erro no backup agendado: {e}")
+            parar.wait(intervalo)
+
+    def iniciar_agendamento(self, intervalo=3600, manter=7, comprimir=True):
+        """Cria backups a cada `intervalo` segundos em uma thread de fundo"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._parar = threading.Event()
+        self._thread = threading.Thread(
+            target=self._executar_agendamento,
+            args=(self._parar, intervalo, manter, comprimir),
+            daemon=True
+        )
+        self._thread.start()
+
+    def parar_agendamento(self):
+        """Interrompe os backups agendados"""
+        if self._thread is not None:
+            self._parar.set()
+            self._thread.join()
+            self._thread = None
+
+def _imprimir(dados):
+    print(json.dumps(dados, ensure_ascii=False, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description="Backup online do banco de colaboradores")
+    parser.add_argument("--db", default="colaboradores.db", help="Arquivo do banco SQLite")
+    parser.add_argument("--pasta", default="backups", help="Pasta dos backups (padrão: backups)")
+    parser.add_argument("--paginas", type=int, default=100, help="Páginas copiadas por passo (padrão: 100)")
+    parser.add_argument("--pausa", type=float, default=0.01, help="Pausa entre passos em segundos (padrão: 0.01)")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    criar = comandos.add_parser("criar", help="Cria um backup agora")
+    criar.add_argument("--comprimir", action="store_true", help="Comprime o backup com gzip")
+
+    comandos.add_parser("listar", help="Lista os backups existentes")
+
+    verificar = comandos.add_parser("verificar", help="Verifica hash e integridade de um backup")
+    verificar.add_argument("arquivo")
+
+    restaurar = comandos.add_parser("restaurar", help="Restaura um backup sobre o banco atual")
+    restaurar.add_argument("arquivo")
+    restaurar.add_argument("--sem-backup-seguranca", action="store_true",
+                           help="Não salva o estado atual antes de restaurar")
+
+    agendar = comandos.add_parser("agendar", help="Cria backups periodicamente até ser interrompido")
+    agendar.add_argument("--intervalo", type=int, default=3600, help="Segundos entre backups (padrão: 3600)")
+    agendar.add_argument("--manter", type=int, default=7, help="Quantidade de backups mantidos (padrão: 7)")
+    agendar.add_argument("--comprimir", action="store_true", help="Comprime os backups com gzip")
+
+    args = parser.parse_args()
+    manager = BackupManager(args.db, args.pasta, args.paginas, args.pausa)
+
+    try:
+        if args.comando == "criar":
+            _imprimir(manager.criar_backup(args.comprimir))
+        elif args.comando == "listar":
+            for metadados in manager.listar_backups():
+                print(f"{metadados['arquivo']}  {metadados.get('tamanho_bytes', '?')} bytes  {metadados.get('criado_em', '')}")
+        elif args.comando == "verificar":
+            manager.verificar_backup(args.arquivo)
+            print(f"✅ Backup íntegro: {args.arquivo}")
+        elif args.comando == "restaurar":
+            _imprimir(manager.restaurar_backup(args.arquivo, not args.sem_backup_seguranca))
+        else:
+            parar = threading.Event()
+            try:
+                manager._executar_agendamento(parar, args.intervalo, args.manter, args.comprimir)
+            except KeyboardInterrupt:
+                parar.set()
+    except ErroBackup as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,99 +1,357 @@
+import calendar
 import sqlite3
+import queue
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
 
+# Chave mês/dia (MMDD, ex.: 1225) das colunas de data. As consultas precisam usar
+# exatamente a mesma expressão dos índices para que o SQLite os aproveite.
+CHAVES_MES_DIA = {
+    'data_nascimento': "CAST(strftime('%m%d', data_nascimento) AS INTEGER)",
+    'data_cadastro': "CAST(strftime('%m%d', data_cadastro) AS INTEGER)"
+}
+
+class ConnectionPool:
+    """Pool de conexões SQLite compartilhadas entre threads"""
+    
+    def __init__(self, db_name, tamanho=5, timeout=30):
+        self._conexoes = queue.LifoQueue()
+        
+        for _ in range(tamanho):
+            conn = sqlite3.connect(db_name, timeout=timeout, check_same_thread=False)
+            self._conexoes.put(conn)
+        
+        # WAL permite que leitores não bloqueiem o escritor (e vice-versa)
+        with self.conexao() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+    
+    @contextmanager
+    def conexao(self):
+        """Empresta uma conexão do pool, aguardando se todas estiverem em uso"""
+        conn = self._conexoes.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._conexoes.put(conn)
+    
+    def fechar(self):
+        """Fecha todas as conexões do pool"""
+        while not self._conexoes.empty():
+            self._conexoes.get_nowait().close()
+
 class DatabaseManager:
-    def __init__(self, db_name="colaboradores.db"):
+    def __init__(self, db_name="colaboradores.db", pool=None):
         self.db_name = db_name
+        self.pool = pool
         self.create_table()
     
+    @contextmanager
+    def _conexao(self):
+        """Conexão do pool, se houver, ou uma conexão nova fechada ao final"""
+        if self.pool is not None:
+            with self.pool.conexao() as conn:
+                yield conn
+        else:
+            conn = sqlite3.connect(self.db_name)
+            try:
+                yield conn
+            finally:
+                conn.close()
+    
     def create_table(self):
         """Cria a tabela de colaboradores se não existir"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS colaboradores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome_completo TEXT NOT NULL,
-                endereco TEXT,
-                bairro TEXT,
-                cidade TEXT,
-                estado TEXT,
-                cep TEXT,
-                telefone TEXT,
-                data_nascimento DATE,
-                cargo TEXT,
-                data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        with self._conexao() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS colaboradores (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    nome_completo TEXT NOT NULL,
+                    endereco TEXT,
+                    bairro TEXT,
+                    cidade TEXT,
+                    estado TEXT,
+                    cep TEXT,
+                    telefone TEXT,
+                    data_nascimento DATE,
+                    cargo TEXT,
+                    data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Índices por mês/dia para as consultas de aniversário
+            for coluna, expressao in CHAVES_MES_DIA.items():
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_colaboradores_{coluna}_mes_dia
+                    ON colaboradores ({expressao})
+                """)
+            
+            # Registro de alterações: cada inserção, atualização ou exclusão gera uma
+            # linha, e o último id registrado funciona como versão dos dados
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS colaboradores_alteracoes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    colaborador_id INTEGER NOT NULL
+                )
+            """)
+            for evento, registro in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_colaboradores_{evento.lower()}
+                    AFTER {evento} ON colaboradores
+                    BEGIN
+                        INSERT INTO colaboradores_alteracoes (colaborador_id) VALUES ({registro}.id);
+                    END
+                """)
+            
+            # Identidade do banco: distingue bancos (e linhas do tempo, após uma
+            # restauração) que poderiam ter a mesma versão de dados
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sistema (
+                    chave TEXT PRIMARY KEY,
+                    valor TEXT
+                )
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO sistema (chave, valor)
+                VALUES ('identidade', lower(hex(randomblob(16))))
+            """)
+            
+            conn.commit()
     
     def inserir_colaborador(self, dados):
         """Insere um novo colaborador no banco de dados"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO colaboradores 
-            (nome_completo, endereco, bairro, cidade, estado, cep, telefone, data_nascimento, cargo)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, dados)
-        
-        conn.commit()
-        conn.close()
+        with self._conexao() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO colaboradores 
+                (nome_completo, endereco, bairro, cidade, estado, cep, telefone, data_nascimento, cargo)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, dados)
+            
+            conn.commit()
         return cursor.lastrowid
     
+    def inserir_colaboradores(self, lista_dados):
+        """Insere vários colaboradores em uma única transação e retorna os IDs"""
+        with self._conexao() as conn:
+            cursor = conn.cursor()
+            ids = []
+            
+            for dados in lista_dados:
+                cursor.execute("""
+                    INSERT INTO colaboradores 
+                    (nome_completo, endereco, bairro, cidade, estado, cep, telefone, data_nascimento, cargo)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, dados)
+                ids.append(cursor.lastrowid)
+            
+            conn.commit()
+        return ids
+    
     def listar_colaboradores(self):
         """Lista todos os colaboradores"""
-        conn = sqlite3.connect(self.db_name)
-        df = pd.read_sql_query("SELECT * FROM colaboradores ORDER BY id DESC", conn)
-        conn.close()
+        with self._conexao() as conn:
+            df = pd.read_sql_query("SELECT * FROM colaboradores ORDER BY id DESC", conn)
         return df
     
+    def listar_colaboradores_pagina(self, filtros=None, apos_id=None, limite=50):
+        """Lista uma página de colaboradores (ordem de ID decrescente) com filtros.
+        
+        A paginação é por cursor: passe em `apos_id` o último ID da página anterior.
+        Retorna (DataFrame, ID para a próxima página ou None).
+        """
+        filtros = filtros or {}
+        condicoes, params = [], []
+        
+        if filtros.get('nome'):
+            condicoes.append("nome_completo LIKE ?")
+            params.append(f"%{filtros['nome']}%")
+        
+        for coluna in ('cargo', 'estado', 'cidade'):
+            if filtros.get(coluna):
+                condicoes.append(f"{coluna} = ?")
+                params.append(filtros[coluna])
+        
+        if apos_id is not None:
+            condicoes.append("id < ?")
+            params.append(apos_id)
+        
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        
+        with self._conexao() as conn:
+            # Um registro a mais indica se existe próxima página
+            df = pd.read_sql_query(
+                f"SELECT * FROM colaboradores {where} ORDER BY id DESC LIMIT ?",
+                conn, params=params + [limite + 1]
+            )
+        
+        if len(df) > limite:
+            df = df.iloc[:limite]
+            return df, int(df['id'].iloc[-1])
+        return df, None
+    
     def buscar_colaborador_por_id(self, id_colaborador):
         """Busca um colaborador específico pelo ID"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM colaboradores WHERE id = ?", (id_colaborador,))
-        colaborador = cursor.fetchone()
-        conn.close()
+        with self._conexao() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM colaboradores WHERE id = ?", (id_colaborador,))
+            colaborador = cursor.fetchone()
         return colaborador
     
     def atualizar_colaborador(self, id_colaborador, dados):
         """Atualiza os dados de um colaborador"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE colaboradores 
-            SET nome_completo=?, endereco=?, bairro=?, cidade=?, estado=?, 
-                cep=?, telefone=?, data_nascimento=?, cargo=?
-            WHERE id=?
-        """, dados + (id_colaborador,))
-        
-        conn.commit()
-        conn.close()
+        with self._conexao() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                UPDATE colaboradores 
+                SET nome_completo=?, endereco=?, bairro=?, cidade=?, estado=?, 
+                    cep=?, telefone=?, data_nascimento=?, cargo=?
+                WHERE id=?
+            """, dados + (id_colaborador,))
+            
+            conn.commit()
         return cursor.rowcount > 0
     
     def excluir_colaborador(self, id_colaborador):
         """Exclui um colaborador pelo ID"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM colaboradores WHERE id = ?", (id_colaborador,))
-        conn.commit()
-        conn.close()
+        with self._conexao() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM colaboradores WHERE id = ?", (id_colaborador,))
+            conn.commit()
         return cursor.rowcount > 0
     
+    def _listar_por_mes_dia(self, coluna, inicio, fim):
+        """Lista colaboradores cujo dia/mês da coluna está entre duas datas"""
+        expressao = CHAVES_MES_DIA[coluna]
+        
+        if (fim - inicio).days >= 365:
+            chave_inicio, chave_fim = 101, 1231
+        else:
+            chave_inicio = inicio.month * 100 + inicio.day
+            chave_fim = fim.month * 100 + fim.day
+            # Em ano não bissexto, quem nasceu em 29/02 é lembrado em 28/02
+            if chave_fim == 228 and not calendar.isleap(fim.year):
+                chave_fim = 229
+        
+        if chave_inicio <= chave_fim:
+            query = f"""
+                SELECT *, {expressao} AS mes_dia FROM colaboradores
+                WHERE {expressao} BETWEEN ? AND ?
+                ORDER BY mes_dia, nome_completo
+            """
+        else:
+            # Intervalo atravessa a virada do ano (ex.: 20/12 a 10/01): duas
+            # faixas no índice, com as datas de dezembro antes das de janeiro
+            query = f"""
+                SELECT *, {expressao} AS mes_dia, 0 AS volta FROM colaboradores
+                WHERE {expressao} >= ?
+                UNION ALL
+                SELECT *, {expressao} AS mes_dia, 1 AS volta FROM colaboradores
+                WHERE {expressao} <= ?
+                ORDER BY volta, mes_dia, nome_completo
+            """
+        
+        with self._conexao() as conn:
+            df = pd.read_sql_query(query, conn, params=(chave_inicio, chave_fim))
+        return df.drop(columns=['volta'], errors='ignore')
+    
+    def listar_aniversariantes(self, inicio, fim):
+        """Lista os aniversariantes entre duas datas (considera apenas dia e mês)"""
+        return self._listar_por_mes_dia('data_nascimento', inicio, fim)
+    
+    def listar_aniversarios_cadastro(self, inicio, fim):
+        """Lista os aniversários de cadastro entre duas datas (considera apenas dia e mês)"""
+        return self._listar_por_mes_dia('data_cadastro', inicio, fim)
+    
+    def _versao_dados(self, conn):
+        cursor = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'colaboradores_alteracoes'"
+        )
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    
+    def obter_versao_dados(self):
+        """Retorna a versão atual dos dados (muda a cada alteração na tabela)"""
+        with self._conexao() as conn:
+            versao = self._versao_dados(conn)
+        return versao
+    
+    def obter_versao_completa(self):
+        """Retorna (identidade do banco, versão dos dados) em uma única leitura"""
+        with self._conexao() as conn:
+            conn.execute("BEGIN")
+            identidade = conn.execute(
+                "SELECT valor FROM sistema WHERE chave = 'identidade'"
+            ).fetchone()[0]
+            versao = self._versao_dados(conn)
+            conn.rollback()
+        return identidade, versao
+    
+    def obter_identidade(self):
+        """Retorna a identidade do banco (muda quando um backup é restaurado)"""
+        with self._conexao() as conn:
+            identidade = conn.execute(
+                "SELECT valor FROM sistema WHERE chave = 'identidade'"
+            ).fetchone()[0]
+        return identidade
+    
+    def obter_alteracoes_desde(self, versao=None):
+        """Retorna (versão atual, colaboradores alterados, ids alterados) desde uma versão.
+        
+        Os ids alterados incluem os excluídos, que não aparecem no DataFrame. Sem
+        versão, ou quando o registro de alterações já não cobre todo o intervalo
+        desde ela, retorna todos os colaboradores e None no lugar dos ids.
+        """
+        with self._conexao() as conn:
+            # Leitura em uma única transação para que versão e dados sejam consistentes
+            conn.execute("BEGIN")
+            versao_atual = self._versao_dados(conn)
+            
+            if versao is not None and versao_atual > versao:
+                # Alterações posteriores à versão já removidas do registro
+                primeira = conn.execute("SELECT MIN(id) FROM colaboradores_alteracoes").fetchone()[0]
+                if primeira is None or primeira > versao + 1:
+                    versao = None
+            elif versao is not None and versao_atual < versao:
+                versao = None
+            
+            if versao is None:
+                df = pd.read_sql_query("SELECT * FROM colaboradores", conn)
+                ids = None
+            else:
+                ids = {row[0] for row in conn.execute("""
+                    SELECT DISTINCT colaborador_id FROM colaboradores_alteracoes
+                    WHERE id > ? AND id <= ?
+                """, (versao, versao_atual))}
+                df = pd.read_sql_query("""
+                    SELECT * FROM colaboradores WHERE id IN (
+                        SELECT colaborador_id FROM colaboradores_alteracoes
+                        WHERE id > ? AND id <= ?
+                    )
+                """, conn, params=(versao, versao_atual))
+            
+            conn.rollback()
+        return versao_atual, df, ids
+    
+    def limpar_alteracoes(self, ate_versao):
+        """Remove do registro as alterações já processadas até a versão informada"""
+        with self._conexao() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM colaboradores_alteracoes WHERE id <= ?", (ate_versao,))
+            conn.commit()
+        return cursor.rowcount
+    
     def contar_colaboradores(self):
         """Retorna o número total de colaboradores"""
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM colaboradores")
-        count = cursor.fetchone()[0]
-        conn.close()
+        with self._conexao() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM colaboradores")
+            count = cursor.fetchone()[0]
         return count
     
     def obter_estatisticas(self):
@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 from database import DatabaseManager
+from relatorios import ReportManager
 import re
 from datetime import date
 
@@ -338,4 +339,50 @@ else:
             df_time['data_cadastro'] = pd.to_datetime(df_time['data_cadastro'])
             df_time['mes_cadastro'] = df_time['data_cadastro'].dt.to_period('M')
             cadastros_por_mes = df_time['mes_cadastro'].value_counts().sort_index()
-            st.line_chart(cadastros_por_mes)
\ No newline at end of file
+            st.line_chart(cadastros_por_mes)
+        
+        st.markdown("---")
+        
+        # Relatórios analíticos (calculados sobre o snapshot em Parquet)
+        st.subheader("📈 Relatórios Analíticos")
+        relatorios = ReportManager(db)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            arquivos_relatorio = {
+                "Cargo × Estado": "cargo_por_estado",
+                "Faixas Etárias": "faixas_etarias",
+                "Crescimento por Cidade": "crescimento_por_cidade"
+            }
+            tipo_relatorio = st.selectbox("Relatório:", list(arquivos_relatorio))
+        
+        with col2:
+            if tipo_relatorio == "Faixas Etárias":
+                opcoes_faixa = {"Total": None, "Cargo": "cargo", "Estado": "estado"}
+                cruzar_por = st.selectbox("Cruzar com:", list(opcoes_faixa))
+            elif tipo_relatorio == "Crescimento por Cidade":
+                opcoes_frequencia = {"Mensal": "M", "Anual": "Y"}
+                frequencia = st.selectbox("Agrupar por:", list(opcoes_frequencia))
+        
+        if tipo_relatorio == "Cargo × Estado":
+            relatorio = relatorios.cargo_por_estado()
+        elif tipo_relatorio == "Faixas Etárias":
+            relatorio = relatorios.faixas_etarias(opcoes_faixa[cruzar_por])
+        else:
+            relatorio = relatorios.crescimento_por_cidade(opcoes_frequencia[frequencia])
+        
+        if relatorio.empty:
+            st.info("ℹ️ Dados insuficientes para este relatório.")
+        else:
+            st.dataframe(relatorio, use_container_width=True)
+            
+            if tipo_relatorio == "Crescimento por Cidade":
+                st.line_chart(relatorio)
+            
+            st.download_button(
+                label="💾 Download CSV",
+                data=relatorios.exportar_csv(relatorio),
+                file_name=f"relatorio_{arquivos_relatorio[tipo_relatorio]}.csv",
+                mime='text/csv'
+            )
\ No newline at end of file
@@ -1,4 +1,5 @@
 import streamlit as st
+from manutencao import MaintenanceManager
 
 # Configuração da página
 st.set_page_config(
@@ -12,14 +13,19 @@ st.set_page_config(
 with open("estilos.md") as arq:
     st.markdown(f"{arq.read()}", unsafe_allow_html=True)
 
+# Manutenção automática do banco em segundo plano (uma thread por processo)
+MaintenanceManager().iniciar_agendamento()
+
 # Páginas do sistema
 pages = {
     "Menu": [
         st.Page("cadastro.py", title="Cadastro de colaboradores"),
-        st.Page("listagem.py", title="Listar/Atualizar/Excluir cadastros")
+        st.Page("listagem.py", title="Listar/Atualizar/Excluir cadastros"),
+        st.Page("aniversariantes.py", title="Aniversariantes")
     ],
     "Sistema": [
-        st.Page("sobre.py", title="Sobre o Sistema")
+        st.Page("sobre.py", title="Sobre o Sistema"),
+        st.Page("administracao.py", title="Administração do Banco")
     ]
 }
 
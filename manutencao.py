@@ -0,0 +1,394 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from database import CHAVES_MES_DIA, DatabaseManager
+
+# Consultas do sistema cujo plano de execução é acompanhado a cada manutenção
+CONSULTAS_MONITORADAS = {
+    'buscar_por_id': ("SELECT * FROM colaboradores WHERE id = ?", (1,)),
+    'listar_colaboradores': ("SELECT * FROM colaboradores ORDER BY id DESC", ()),
+    'pagina_por_estado': (
+        "SELECT * FROM colaboradores WHERE estado = ? AND id < ? ORDER BY id DESC LIMIT ?", ('SP', 1000, 51)
+    ),
+    'aniversariantes': (
+        f"SELECT * FROM colaboradores WHERE {CHAVES_MES_DIA['data_nascimento']} BETWEEN ? AND ?", (101, 131)
+    ),
+    'alteracoes_desde': (
+        "SELECT DISTINCT colaborador_id FROM colaboradores_alteracoes WHERE id > ? AND id <= ?", (0, 100)
+    ),
+}
+
+# Acima desta fração de páginas livres, recomenda-se habilitar o vacuum incremental
+LIMITE_PAGINAS_LIVRES = 0.2
+
+# Variação no número de linhas, desde o último ANALYZE, a partir da qual as
+# estatísticas do planejador de uma tabela são consideradas desatualizadas
+# (variações menores que VARIACAO_MINIMA_LINHAS são ignoradas em tabelas pequenas)
+LIMITE_VARIACAO_LINHAS = 0.1
+VARIACAO_MINIMA_LINHAS = 100
+
+# Agendamentos em execução neste processo, por banco (evita threads duplicadas
+# a cada rerun do Streamlit)
+_agendamentos = {}
+_lock = threading.Lock()
+# Uma execução de manutenção por banco neste processo (botão x agendamento)
+_execucoes = {}
+# Último erro da manutenção agendada de cada banco: (quando, mensagem)
+_erros = {}
+
+class ManutencaoEmExecucao(Exception):
+    pass
+
+class MaintenanceManager:
+    def __init__(self, db_name="colaboradores.db", janela=(2, 5), minutos_ocioso=10,
+                 horas_entre_execucoes=20, paginas_vacuum=2000):
+        self.db_name = db_name
+        self.db = DatabaseManager(db_name)
+        # Janela de baixo uso (hora inicial, hora final); pode atravessar a meia-noite
+        self.janela = janela
+        self.minutos_ocioso = minutos_ocioso
+        self.horas_entre_execucoes = horas_entre_execucoes
+        self.paginas_vacuum = paginas_vacuum
+        self.create_table()
+
+    def _conectar(self):
+        return sqlite3.connect(self.db_name, timeout=30)
+
+    def create_table(self):
+        """Cria a tabela de histórico de manutenção se não existir"""
+        conn = self._conectar()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS manutencao_historico (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                executado_em TIMESTAMP NOT NULL,
+                duracao_s REAL,
+                tamanho_bytes INTEGER,
+                paginas INTEGER,
+                paginas_livres INTEGER,
+                paginas_liberadas INTEGER,
+                integridade TEXT,
+                planos TEXT,
+                planos_alterados TEXT,
+                mensagens TEXT
+            )
+        """)
+        # Linhas de cada tabela no último ANALYZE: as estimativas do sqlite_stat1
+        # são aproximadas (analysis_limit) e não servem para medir a variação
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS manutencao_estatisticas (
+                tabela TEXT PRIMARY KEY,
+                linhas INTEGER NOT NULL,
+                analisado_em TIMESTAMP NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def estatisticas_arquivo(self):
+        """Retorna tamanho do arquivo, páginas, páginas livres e modos do banco"""
+        conn = self._conectar()
+        pragma = lambda nome: conn.execute(f"PRAGMA {nome}").fetchone()[0]
+        stats = {
+            'tamanho_bytes': os.path.getsize(self.db_name),
+            'tamanho_wal_bytes': os.path.getsize(self.db_name + "-wal") if os.path.exists(self.db_name + "-wal") else 0,
+            'tamanho_pagina': pragma("page_size"),
+            'paginas': pragma("page_count"),
+            'paginas_livres': pragma("freelist_count"),
+            'journal_mode': pragma("journal_mode"),
+            'vacuum_incremental': pragma("auto_vacuum") == 2
+        }
+        conn.close()
+        stats['fracao_livre'] = stats['paginas_livres'] / stats['paginas'] if stats['paginas'] else 0.0
+        return stats
+
+    def capturar_planos(self):
+        """Retorna o plano de execução (EXPLAIN QUERY PLAN) de cada consulta monitorada"""
+        conn = self._conectar()
+        planos = {}
+        for nome, (sql, params) in CONSULTAS_MONITORADAS.items():
+            linhas = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            planos[nome] = "\n".join(linha[-1] for linha in linhas)
+        conn.close()
+        return planos
+
+    def tabelas_desatualizadas(self, conn=None):
+        """Retorna {tabela: linhas atuais} das tabelas que precisam de ANALYZE.
+
+        Uma tabela está desatualizada se nunca foi analisada ou se o número de
+        linhas variou mais que LIMITE_VARIACAO_LINHAS (e que VARIACAO_MINIMA_LINHAS)
+        desde o último ANALYZE.
+        """
+        propria = conn is None
+        conn = conn or self._conectar()
+        try:
+            tabelas = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )]
+            analisadas = {}
+            # Sem sqlite_stat1 (removida ou nunca criada), todas precisam de ANALYZE
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+                analisadas = dict(conn.execute("SELECT tabela, linhas FROM manutencao_estatisticas"))
+
+            desatualizadas = {}
+            for tabela in tabelas:
+                linhas = conn.execute(f'SELECT COUNT(*) FROM "{tabela}"').fetchone()[0]
+                anteriores = analisadas.get(tabela)
+                if anteriores is None:
+                    desatualizadas[tabela] = linhas
+                elif abs(linhas - anteriores) > max(anteriores * LIMITE_VARIACAO_LINHAS, VARIACAO_MINIMA_LINHAS):
+                    desatualizadas[tabela] = linhas
+            return desatualizadas
+        finally:
+            if propria:
+                conn.close()
+
+    def listar_historico(self, limite=100):
+        """Lista as últimas execuções de manutenção (mais recente primeiro)"""
+        conn = self._conectar()
+        df = pd.read_sql_query(
+            "SELECT * FROM manutencao_historico ORDER BY id DESC LIMIT ?", conn, params=(limite,)
+        )
+        conn.close()
+        return df
+
+    def ultima_execucao(self):
+        """Retorna a última execução como dicionário, ou None"""
+        df = self.listar_historico(1)
+        if df.empty:
+            return None
+        execucao = df.iloc[0].to_dict()
+        for coluna in ('planos', 'planos_alterados', 'mensagens'):
+            execucao[coluna] = json.loads(execucao[coluna] or 'null')
+        return execucao
+
+    def _trava(self):
+        """Trava que impede duas manutenções simultâneas no mesmo banco"""
+        with _lock:
+            return _execucoes.setdefault(os.path.abspath(self.db_name), threading.Lock())
+
+    def em_execucao(self):
+        """Indica se há uma manutenção em andamento neste banco"""
+        return self._trava().locked()
+
+    def executar_manutencao(self, verificacao_completa=False):
+        """Executa a manutenção; levanta ManutencaoEmExecucao se outra já estiver em andamento"""
+        trava = self._trava()
+        if not trava.acquire(blocking=False):
+            raise ManutencaoEmExecucao("Manutenção já em execução")
+        try:
+            return self._executar_manutencao(verificacao_completa)
+        finally:
+            trava.release()
+
+    def _executar_manutencao(self, verificacao_completa):
+        """Executa ANALYZE, vacuum incremental, checkpoint e verificação de integridade"""
+        inicio = time.perf_counter()
+        antes = self.estatisticas_arquivo()
+        mensagens = []
+
+        conn = self._conectar()
+        try:
+            # quick_check é O(N) mas não confere os índices; integrity_check é o completo
+            verificacao = "integrity_check" if verificacao_completa else "quick_check"
+            resultado = [row[0] for row in conn.execute(f"PRAGMA {verificacao}")]
+            integridade = 'ok' if resultado == ['ok'] else "; ".join(resultado[:10])
+            if integridade != 'ok':
+                mensagens.append(f"Falha na verificação de integridade ({verificacao})")
+
+            # Estatísticas do planejador: ANALYZE (amostrado) só nas tabelas cujo
+            # número de linhas mudou bastante desde a última análise
+            conn.execute("PRAGMA analysis_limit=1000")
+            desatualizadas = self.tabelas_desatualizadas(conn)
+            analisado_em = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for tabela, linhas in desatualizadas.items():
+                conn.execute(f'ANALYZE "{tabela}"')
+                conn.execute(
+                    "INSERT OR REPLACE INTO manutencao_estatisticas (tabela, linhas, analisado_em) VALUES (?, ?, ?)",
+                    (tabela, linhas, analisado_em)
+                )
+            conn.commit()
+            if desatualizadas:
+                mensagens.append(f"Estatísticas do planejador atualizadas (ANALYZE): {', '.join(sorted(desatualizadas))}")
+
+            if antes['vacuum_incremental']:
+                conn.execute(f"PRAGMA incremental_vacuum({int(self.paginas_vacuum)})").fetchall()
+                conn.commit()
+            elif antes['fracao_livre'] > LIMITE_PAGINAS_LIVRES:
+                mensagens.append(
+                    f"{antes['fracao_livre']:.0%} das páginas estão livres: habilite o vacuum incremental"
+                )
+
+            if antes['journal_mode'] == 'wal':
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchall()
+        finally:
+            conn.close()
+
+        planos = self.capturar_planos()
+        anterior = self.ultima_execucao()
+        planos_anteriores = (anterior or {}).get('planos') or {}
+        planos_alterados = sorted(
+            nome for nome, plano in planos.items()
+            if nome in planos_anteriores and planos_anteriores[nome] != plano
+        )
+        if planos_alterados:
+            mensagens.append(f"Plano de execução alterado: {', '.join(planos_alterados)}")
+
+        depois = self.estatisticas_arquivo()
+        execucao = {
+            'executado_em': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'duracao_s': round(time.perf_counter() - inicio, 3),
+            'tamanho_bytes': depois['tamanho_bytes'],
+            'paginas': depois['paginas'],
+            'paginas_livres': depois['paginas_livres'],
+            'paginas_liberadas': antes['paginas'] - depois['paginas'],
+            'integridade': integridade,
+            'planos': planos,
+            'planos_alterados': planos_alterados,
+            'mensagens': mensagens
+        }
+
+        conn = self._conectar()
+        conn.execute("""
+            INSERT INTO manutencao_historico
+            (executado_em, duracao_s, tamanho_bytes, paginas, paginas_livres, paginas_liberadas,
+             integridade, planos, planos_alterados, mensagens)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            execucao['executado_em'], execucao['duracao_s'], execucao['tamanho_bytes'],
+            execucao['paginas'], execucao['paginas_livres'], execucao['paginas_liberadas'],
+            execucao['integridade'], json.dumps(planos, ensure_ascii=False),
+            json.dumps(planos_alterados), json.dumps(mensagens, ensure_ascii=False)
+        ))
+        conn.commit()
+        conn.close()
+        return execucao
+
+    def habilitar_vacuum_incremental(self):
+        """Ativa auto_vacuum=INCREMENTAL; exige um VACUUM completo, que bloqueia o banco"""
+        trava = self._trava()
+        if not trava.acquire(blocking=False):
+            raise ManutencaoEmExecucao("Manutenção já em execução")
+        try:
+            conn = self._conectar()
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            conn.close()
+        finally:
+            trava.release()
+        return self.estatisticas_arquivo()
+
+    def em_janela(self, agora=None):
+        """Indica se o horário está dentro da janela de baixo uso"""
+        hora = (agora or datetime.now()).hour
+        inicio, fim = self.janela
+        if inicio <= fim:
+            return inicio <= hora < fim
+        return hora >= inicio or hora < fim
+
+    def _deve_executar(self, agora, ocioso_desde):
+        if not self.em_janela(agora):
+            return False
+        if agora - ocioso_desde < timedelta(minutes=self.minutos_ocioso):
+            return False
+        ultima = self.ultima_execucao()
+        if ultima is None:
+            return True
+        executado_em = datetime.strptime(ultima['executado_em'], '%Y-%m-%d %H:%M:%S')
+        return agora - executado_em >= timedelta(hours=self.horas_entre_execucoes)
+
+    def _executar_agendamento(self, parar, intervalo_verificacao):
+        chave = os.path.abspath(self.db_name)
+        versao, ocioso_desde = None, datetime.now()
+        while not parar.is_set():
+            try:
+                # Sem alterações nos dados desde a última verificação = banco ocioso
+                versao_atual = self.db.obter_versao_dados()
+                if versao_atual != versao:
+                    versao, ocioso_desde = versao_atual, datetime.now()
+
+                if self._deve_executar(datetime.now(), ocioso_desde):
+                    self.executar_manutencao()
+                    _erros.pop(chave, None)
+            except ManutencaoEmExecucao:
+                # Execução manual em andamento; tenta de novo na próxima verificação
+                pass
+            except Exception as e:
+                _erros[chave] = (datetime.now(), str(e))
+            parar.wait(intervalo_verificacao)
+
+    def iniciar_agendamento(self, intervalo_verificacao=300):
+        """Inicia (uma vez por processo) a thread que executa a manutenção na janela de baixo uso"""
+        with _lock:
+            chave = os.path.abspath(self.db_name)
+            thread, _ = _agendamentos.get(chave, (None, None))
+            if thread is not None and thread.is_alive():
+                return
+            parar = threading.Event()
+            thread = threading.Thread(
+                target=self._executar_agendamento, args=(parar, intervalo_verificacao), daemon=True
+            )
+            _agendamentos[chave] = (thread, parar)
+            thread.start()
+
+    def parar_agendamento(self):
+        """Interrompe a manutenção agendada deste banco"""
+        with _lock:
+            thread, parar = _agendamentos.pop(os.path.abspath(self.db_name), (None, None))
+        if thread is not None:
+            parar.set()
+            thread.join()
+
+    def ultimo_erro(self):
+        """Retorna (quando, mensagem) da última falha da manutenção agendada, ou None"""
+        return _erros.get(os.path.abspath(self.db_name))
+
+    def agendamento_ativo(self):
+        """Indica se há uma thread de manutenção ativa para este banco neste processo"""
+        thread, _ = _agendamentos.get(os.path.abspath(self.db_name), (None, None))
+        return thread is not None and thread.is_alive()
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção do banco de colaboradores")
+    parser.add_argument("--db", default="colaboradores.db", help="Arquivo do banco SQLite")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    executar = comandos.add_parser("executar", help="Executa a manutenção agora")
+    executar.add_argument("--completa", action="store_true", help="Usa integrity_check em vez de quick_check")
+
+    comandos.add_parser("status", help="Mostra o estado do arquivo e a última manutenção")
+    comandos.add_parser("habilitar-vacuum-incremental", help="Ativa o vacuum incremental (executa VACUUM)")
+
+    agendar = comandos.add_parser("agendar", help="Executa a manutenção na janela de baixo uso até ser interrompido")
+    agendar.add_argument("--inicio", type=int, default=2, help="Hora inicial da janela (padrão: 2)")
+    agendar.add_argument("--fim", type=int, default=5, help="Hora final da janela (padrão: 5)")
+    agendar.add_argument("--verificar-a-cada", type=int, default=300, help="Segundos entre verificações (padrão: 300)")
+
+    args = parser.parse_args()
+
+    if args.comando == "agendar":
+        manager = MaintenanceManager(args.db, janela=(args.inicio, args.fim))
+        parar = threading.Event()
+        try:
+            manager._executar_agendamento(parar, args.verificar_a_cada)
+        except KeyboardInterrupt:
+            parar.set()
+        return
+
+    manager = MaintenanceManager(args.db)
+    if args.comando == "executar":
+        resultado = manager.executar_manutencao(args.completa)
+    elif args.comando == "habilitar-vacuum-incremental":
+        resultado = manager.habilitar_vacuum_incremental()
+    else:
+        resultado = {'arquivo': manager.estatisticas_arquivo(), 'ultima_execucao': manager.ultima_execucao()}
+    print(json.dumps(resultado, ensure_ascii=False, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import os
+import re
+import threading
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from database import DatabaseManager
+
+# Colunas copiadas para o snapshot analítico (sem dados de contato)
+COLUNAS_SNAPSHOT = ['id', 'cidade', 'estado', 'cargo', 'data_nascimento', 'data_cadastro']
+
+FAIXAS_ETARIAS = [0, 18, 25, 35, 45, 55, 65, 200]
+ROTULOS_FAIXAS = ['Até 17', '18-24', '25-34', '35-44', '45-54', '55-64', '65+']
+
+# Arquivos do snapshot: uma base completa e os deltas gravados a cada versão
+ARQUIVO_SNAPSHOT = re.compile(r'^(base|delta)-(\d{20})\.parquet$')
+# Acima desta quantidade de deltas, a base é regravada já com eles aplicados
+MAXIMO_DELTAS = 20
+
+# Cache compartilhado entre as sessões do Streamlit: snapshot carregado e
+# resultados dos relatórios, indexados pela identidade do banco, pela versão
+# dos dados e pelo dia (as idades mudam com a data). Só a geração atual de cada
+# snapshot é mantida.
+_cache = {}
+_lock_cache = threading.Lock()
+_lock = threading.RLock()
+
+class ReportManager:
+    def __init__(self, db=None, snapshot_path=None):
+        self.db = db or DatabaseManager()
+        self.snapshot_path = snapshot_path or os.path.splitext(self.db.db_name)[0] + ".parquet"
+
+    def _arquivos(self, identidade):
+        """Lista [(versão, caminho)] da base e dos deltas posteriores a ela.
+
+        Retorna None se não houver snapshot ou se algum arquivo for de outro banco.
+        """
+        if not os.path.isdir(self.snapshot_path):
+            return None
+
+        bases, deltas = [], []
+        for nome in os.listdir(self.snapshot_path):
+            encontrado = ARQUIVO_SNAPSHOT.match(nome)
+            if encontrado:
+                arquivo = (int(encontrado[2]), os.path.join(self.snapshot_path, nome))
+                (bases if encontrado[1] == 'base' else deltas).append(arquivo)
+        if not bases:
+            return None
+
+        base = max(bases)
+        arquivos = [base] + sorted(delta for delta in deltas if delta[0] > base[0])
+        for _, caminho in arquivos:
+            metadata = pq.read_schema(caminho).metadata or {}
+            if metadata.get(b'identidade_banco') != identidade.encode():
+                return None
+        return arquivos
+
+    def _preparar(self, df):
+        """Converte os registros do SQLite para os tipos do snapshot"""
+        df = df[COLUNAS_SNAPSHOT].copy()
+        df['id'] = df['id'].astype('int64')
+        df['data_nascimento'] = pd.to_datetime(df['data_nascimento'], errors='coerce')
+        df['data_cadastro'] = pd.to_datetime(df['data_cadastro'], errors='coerce')
+        return df
+
+    def _gravar(self, df, tipo, versao, identidade):
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(tabela.schema.metadata or {})
+        metadata[b'versao_dados'] = str(versao).encode()
+        metadata[b'identidade_banco'] = identidade.encode()
+        tabela = tabela.replace_schema_metadata(metadata)
+
+        # Grava em arquivo temporário e troca, para nunca expor um arquivo pela metade
+        caminho = os.path.join(self.snapshot_path, f"{tipo}-{versao:020d}.parquet")
+        pq.write_table(tabela, caminho + ".tmp")
+        os.replace(caminho + ".tmp", caminho)
+        return caminho
+
+    def _gravar_base(self, df, versao, identidade):
+        """Grava o snapshot completo e remove a base e os deltas anteriores"""
+        if os.path.isfile(self.snapshot_path):
+            # Snapshot no formato antigo, em um único arquivo
+            os.remove(self.snapshot_path)
+        os.makedirs(self.snapshot_path, exist_ok=True)
+
+        caminho = self._gravar(df.sort_values('id', ignore_index=True), 'base', versao, identidade)
+        for nome in os.listdir(self.snapshot_path):
+            if os.path.join(self.snapshot_path, nome) != caminho:
+                os.remove(os.path.join(self.snapshot_path, nome))
+
+    def _aplicar_deltas(self, df, caminhos):
+        """Aplica os deltas, em ordem de versão, sobre um snapshot já carregado"""
+        if not caminhos:
+            return df
+        deltas = pd.concat([pd.read_parquet(caminho) for caminho in caminhos], ignore_index=True)
+        deltas = deltas.drop_duplicates('id', keep='last')
+        mantidos = df[~df['id'].isin(deltas['id'])]
+        alterados = deltas[~deltas['excluido']].drop(columns='excluido')
+        partes = [parte for parte in (mantidos, alterados) if not parte.empty]
+        if not partes:
+            return df.iloc[0:0]
+        return pd.concat(partes, ignore_index=True).sort_values('id', ignore_index=True)
+
+    def atualizar_snapshot(self):
+        """Atualiza o snapshot com as alterações desde a última versão.
+
+        Retorna (identidade do banco, versão) do snapshot gravado. Cada versão
+        vira um arquivo delta só com as linhas alteradas (e os ids excluídos),
+        de modo que o custo da gravação acompanha o tamanho da alteração.
+        """
+        with _lock:
+            identidade, versao_atual = self.db.obter_versao_completa()
+            arquivos = self._arquivos(identidade)
+            versao_snapshot = arquivos[-1][0] if arquivos else None
+
+            if versao_snapshot == versao_atual:
+                return identidade, versao_atual
+
+            # O banco decide se o registro de alterações ainda cobre o intervalo;
+            # se não cobrir (ids = None), o snapshot é reconstruído por completo
+            versao, alterados, ids = self.db.obter_alteracoes_desde(versao_snapshot)
+            alterados = self._preparar(alterados)
+
+            if ids is None:
+                self._gravar_base(alterados, versao, identidade)
+            else:
+                excluidos = pd.DataFrame({'id': sorted(ids - set(alterados['id']))}, dtype='int64')
+                excluidos = self._preparar(excluidos.reindex(columns=COLUNAS_SNAPSHOT))
+                delta = pd.concat(
+                    [alterados.assign(excluido=False), excluidos.assign(excluido=True)], ignore_index=True
+                )
+                self._gravar(delta, 'delta', versao, identidade)
+
+            self.db.limpar_alteracoes(versao)
+            return identidade, versao
+
+    def carregar_snapshot(self):
+        """Retorna (geração do cache, snapshot atualizado como DataFrame)"""
+        with _lock:
+            # Após uma restauração a versão pode se repetir; a identidade distingue as linhas do tempo
+            identidade, versao = self.atualizar_snapshot()
+            geracao = (self.snapshot_path, identidade, versao, date.today())
+            chave = geracao + ('snapshot',)
+
+            with _lock_cache:
+                df = _cache.get(chave)
+                anteriores = {
+                    k[2]: v for k, v in _cache.items()
+                    if k[:2] == (self.snapshot_path, identidade) and k[-1] == 'snapshot'
+                }
+            if df is None:
+                arquivos = self._arquivos(identidade)
+                versoes = [versao_arquivo for versao_arquivo, _ in arquivos]
+                # Partindo de uma versão já carregada, basta ler os deltas seguintes
+                carregada = max((v for v in anteriores if v in versoes), default=None)
+                if carregada is None:
+                    df = self._aplicar_deltas(pd.read_parquet(arquivos[0][1]), [c for _, c in arquivos[1:]])
+                else:
+                    df = self._aplicar_deltas(anteriores[carregada], [c for v, c in arquivos if v > carregada])
+
+                if len(arquivos) > MAXIMO_DELTAS:
+                    # Compactação: o custo de regravar a base se dilui entre os deltas
+                    self._gravar_base(df, versao, identidade)
+
+                with _lock_cache:
+                    # Descarta versões e dias anteriores deste snapshot
+                    for antiga in [k for k in _cache if k[0] == self.snapshot_path and k[:4] != geracao]:
+                        del _cache[antiga]
+                    _cache[chave] = df
+
+        return geracao, df
+
+    def _executar(self, nome, funcao, *params):
+        geracao, df = self.carregar_snapshot()
+        chave = geracao + (nome,) + params
+
+        with _lock_cache:
+            resultado = _cache.get(chave)
+        if resultado is None:
+            resultado = funcao(df, *params)
+            with _lock_cache:
+                _cache[chave] = resultado
+
+        return resultado.copy()
+
+    def cargo_por_estado(self):
+        """Tabela cruzada de colaboradores por cargo (linhas) e estado (colunas)"""
+        def calcular(df):
+            return pd.crosstab(df['cargo'], df['estado'], margins=True, margins_name='Total')
+
+        return self._executar('cargo_por_estado', calcular)
+
+    def faixas_etarias(self, por=None):
+        """Colaboradores por faixa etária, opcionalmente cruzados com outra coluna"""
+        def calcular(df, por):
+            hoje = date.today()
+            nascimento = df['data_nascimento']
+            idade = hoje.year - nascimento.dt.year
+            # Desconta um ano de quem ainda não fez aniversário neste ano
+            ainda_nao = (nascimento.dt.month * 100 + nascimento.dt.day) > (hoje.month * 100 + hoje.day)
+            idade = idade - ainda_nao.astype(int)
+            faixa = pd.cut(idade, FAIXAS_ETARIAS, labels=ROTULOS_FAIXAS, right=False).rename('faixa_etaria')
+
+            if por is None:
+                return faixa.value_counts(sort=False).rename('Colaboradores').to_frame()
+            return pd.crosstab(faixa, df[por]).reindex(ROTULOS_FAIXAS, fill_value=0)
+
+        return self._executar('faixas_etarias', calcular, por)
+
+    def crescimento_por_cidade(self, frequencia='M'):
+        """Quadro acumulado de colaboradores por cidade ao longo do tempo ('M' ou 'Y')"""
+        def calcular(df, frequencia):
+            df = df.dropna(subset=['data_cadastro'])
+            periodo = df['data_cadastro'].dt.to_period(frequencia)
+            novos = pd.crosstab(periodo, df['cidade'].fillna('Não informada'))
+
+            if novos.empty:
+                return novos
+
+            # Inclui os períodos sem cadastros para a série ficar contínua
+            novos = novos.reindex(pd.period_range(novos.index.min(), novos.index.max(), freq=frequencia), fill_value=0)
+            novos.index = novos.index.astype(str).rename('periodo')
+            return novos.cumsum()
+
+        return self._executar('crescimento_por_cidade', calcular, frequencia)
+
+    def exportar_csv(self, df):
+        """Converte um relatório em CSV (UTF-8) para download"""
+        return df.to_csv().encode('utf-8')
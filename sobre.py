@@ -115,14 +115,18 @@ with st.expander("🔧 Informações Técnicas"):
     - `database.py` - Gerenciador do banco de dados
     - `cadastro.py` - Página de cadastro de colaboradores
     - `listagem.py` - Página de listagem e gerenciamento
+    - `aniversariantes.py` - Página de aniversariantes do período
     - `sobre.py` - Esta página de informações
+    - `relatorios.py` - Motor de relatórios analíticos
+    - `api.py` - API JSON para integrações
+    - `backup.py` - Backup online e restauração do banco
+    - `manutencao.py` - Manutenção automática do banco
+    - `administracao.py` - Página de administração do banco
     
     ### 🚀 Funcionalidades Futuras:
     
     - Upload em lote via arquivo Excel/CSV
     - Autenticação de usuários
-    - API REST para integrações
-    - Backup automático do banco
     - Logs de auditoria
     - Relatórios personalizados
     - Integração com API de CEP
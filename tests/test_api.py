@@ -0,0 +1,219 @@
+import asyncio
+import gzip
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from api import ColaboradoresAPI
+from database import DatabaseManager
+
+def colaborador(nome, estado="SP", **campos):
+    dados = {
+        'nome_completo': nome, 'cidade': "São Paulo", 'estado': estado,
+        'cep': "01001-000", 'telefone': "(11) 99999-0000",
+        'data_nascimento': "1990-05-17", 'cargo': "Analista",
+    }
+    dados.update(campos)
+    return dados
+
+@pytest.fixture
+def servidor(tmp_path):
+    """Sobe a API em um banco temporário, com o loop de eventos em outra thread"""
+    db = DatabaseManager(str(tmp_path / "colaboradores.db"))
+    api = ColaboradoresAPI(db)
+
+    loop = asyncio.new_event_loop()
+    servidor = loop.run_until_complete(asyncio.start_server(api.atender, '127.0.0.1', 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield servidor.sockets[0].getsockname()[1], db
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    servidor.close()
+    loop.run_until_complete(servidor.wait_closed())
+    loop.close()
+
+def requisitar(porta, metodo, caminho, corpo=None, headers=None, conexao=None):
+    """Faz uma requisição e retorna (status, resposta, corpo JSON decodificado)"""
+    conn = conexao or http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+    dados = json.dumps(corpo).encode('utf-8') if corpo is not None else None
+    conn.request(metodo, caminho, body=dados, headers=headers or {})
+    resposta = conn.getresponse()
+    bruto = resposta.read()
+    if conexao is None:
+        conn.close()
+
+    if resposta.getheader('Content-Encoding') == 'gzip':
+        bruto = gzip.decompress(bruto)
+    payload = json.loads(bruto) if bruto else None
+    return resposta.status, resposta, payload
+
+def requisitar_bruto(porta, dados):
+    """Envia bytes diretamente e retorna a linha de status da resposta"""
+    with socket.create_connection(('127.0.0.1', porta), timeout=5) as sock:
+        sock.sendall(dados)
+        return sock.makefile('rb').readline().decode('latin-1').strip()
+
+def test_criar_obter_e_excluir(servidor):
+    porta, _ = servidor
+
+    status, _, payload = requisitar(porta, 'POST', '/colaboradores', colaborador("Ana Souza"))
+    assert status == 201
+    id_colaborador = payload['id']
+
+    status, _, payload = requisitar(porta, 'GET', f'/colaboradores/{id_colaborador}')
+    assert status == 200
+    assert payload['nome_completo'] == "Ana Souza"
+    assert payload['data_nascimento'] == "1990-05-17"
+
+    status, _, payload = requisitar(porta, 'DELETE', f'/colaboradores/{id_colaborador}')
+    assert status == 204 and payload is None
+
+    status, _, payload = requisitar(porta, 'GET', f'/colaboradores/{id_colaborador}')
+    assert status == 404
+
+def test_keep_alive(servidor):
+    porta, _ = servidor
+    conn = http.client.HTTPConnection('127.0.0.1', porta, timeout=5)
+
+    for i in range(3):
+        status, _, _ = requisitar(porta, 'POST', '/colaboradores', colaborador(f"Pessoa {i}"), conexao=conn)
+        assert status == 201
+
+    status, _, payload = requisitar(porta, 'GET', '/colaboradores', conexao=conn)
+    assert status == 200
+    assert len(payload['dados']) == 3
+    conn.close()
+
+def test_paginacao_por_cursor(servidor):
+    porta, _ = servidor
+    lote = [colaborador(f"Pessoa {i}", estado="MG" if i % 2 else "SP") for i in range(7)]
+    status, _, payload = requisitar(porta, 'POST', '/colaboradores/lote', lote)
+    assert status == 201
+    ids = payload['ids']
+
+    vistos, cursor = [], None
+    while True:
+        caminho = '/colaboradores?limite=3' + (f'&cursor={cursor}' if cursor else '')
+        status, _, payload = requisitar(porta, 'GET', caminho)
+        assert status == 200
+        assert len(payload['dados']) <= 3
+        vistos += [registro['id'] for registro in payload['dados']]
+        cursor = payload['proximo_cursor']
+        if cursor is None:
+            break
+
+    assert vistos == sorted(ids, reverse=True)
+
+    status, _, payload = requisitar(porta, 'GET', '/colaboradores?estado=MG&limite=500')
+    assert {registro['estado'] for registro in payload['dados']} == {"MG"}
+    assert len(payload['dados']) == 3
+
+@pytest.mark.parametrize('caminho', [
+    '/colaboradores?limite=0',
+    '/colaboradores?limite=501',
+    '/colaboradores?cursor=abc',
+    '/colaboradores?cursor=99999999999999999999',
+])
+def test_parametros_invalidos(servidor, caminho):
+    porta, _ = servidor
+    status, _, payload = requisitar(porta, 'GET', caminho)
+    assert status == 400
+    assert 'erro' in payload
+
+def test_etag_e_304(servidor):
+    porta, _ = servidor
+    requisitar(porta, 'POST', '/colaboradores', colaborador("Ana Souza"))
+
+    status, resposta, _ = requisitar(porta, 'GET', '/estatisticas')
+    assert status == 200
+    etag = resposta.getheader('ETag')
+    assert etag
+
+    status, resposta, payload = requisitar(porta, 'GET', '/estatisticas', headers={'If-None-Match': etag})
+    assert status == 304 and payload is None
+    assert resposta.getheader('ETag') == etag
+
+    # Qualquer gravação muda a versão dos dados e invalida a ETag
+    requisitar(porta, 'POST', '/colaboradores', colaborador("Bruno Lima"))
+
+    status, resposta, payload = requisitar(porta, 'GET', '/estatisticas', headers={'If-None-Match': etag})
+    assert status == 200
+    assert resposta.getheader('ETag') != etag
+    assert payload['total_colaboradores'] == 2
+
+def test_if_none_match_asterisco(servidor):
+    porta, _ = servidor
+    _, _, payload = requisitar(porta, 'POST', '/colaboradores', colaborador("Ana Souza"))
+
+    status, _, _ = requisitar(porta, 'GET', f"/colaboradores/{payload['id']}", headers={'If-None-Match': '*'})
+    assert status == 304
+
+    # Sem representação atual, "*" não casa
+    status, _, payload = requisitar(porta, 'GET', '/colaboradores/99999', headers={'If-None-Match': '*'})
+    assert status == 404
+    assert 'erro' in payload
+
+def test_gzip(servidor):
+    porta, _ = servidor
+    lote = [colaborador(f"Pessoa com nome longo {i}") for i in range(30)]
+    requisitar(porta, 'POST', '/colaboradores/lote', lote)
+
+    status, resposta, payload = requisitar(porta, 'GET', '/colaboradores', headers={'Accept-Encoding': 'gzip'})
+    assert status == 200
+    assert resposta.getheader('Content-Encoding') == 'gzip'
+    assert len(payload['dados']) == 30
+
+    status, resposta, payload = requisitar(porta, 'GET', '/colaboradores')
+    assert resposta.getheader('Content-Encoding') is None
+    assert len(payload['dados']) == 30
+
+def test_lote_com_item_invalido_nao_insere(servidor):
+    porta, db = servidor
+    lote = [colaborador("Ana Souza"), colaborador("Bruno Lima", cep="123"), colaborador("Carla Dias")]
+
+    status, _, payload = requisitar(porta, 'POST', '/colaboradores/lote', lote)
+    assert status == 400
+    assert payload['erro'].startswith("Item 1:")
+    assert db.contar_colaboradores() == 0
+
+def test_erros_de_validacao(servidor):
+    porta, db = servidor
+
+    status, _, payload = requisitar(porta, 'POST', '/colaboradores', colaborador("", estado="XX"))
+    assert status == 400
+    assert "Nome completo" in payload['erro'] and "UF" in payload['erro']
+
+    status, _, _ = requisitar(porta, 'POST', '/colaboradores', {'nome_completo': "Ana", 'salario': "1"})
+    assert status == 400
+    assert db.contar_colaboradores() == 0
+
+def test_rotas_e_metodos(servidor):
+    porta, _ = servidor
+
+    status, _, _ = requisitar(porta, 'GET', '/inexistente')
+    assert status == 404
+
+    status, resposta, _ = requisitar(porta, 'PATCH', '/colaboradores')
+    assert status == 405
+    assert resposta.getheader('Allow') == 'GET, POST'
+
+    status, _, _ = requisitar(porta, 'GET', f'/colaboradores/{2 ** 64}')
+    assert status == 404
+
+def test_requisicoes_malformadas(servidor):
+    porta, _ = servidor
+
+    assert requisitar_bruto(porta, b'POST /colaboradores HTTP/1.1\r\nContent-Length: 3\r\n\r\n{x}').startswith('HTTP/1.1 400')
+    assert requisitar_bruto(porta, b'GET /colaboradores\r\n\r\n').startswith('HTTP/1.1 400')
+    assert requisitar_bruto(porta, b'GET / HTTP/1.1\r\nContent-Length: -1\r\n\r\n').startswith('HTTP/1.1 400')
+
+    # Linhas acima do limite do StreamReader
+    cabecalho = b'X-Grande: ' + b'a' * 70000 + b'\r\n'
+    assert requisitar_bruto(porta, b'GET /colaboradores HTTP/1.1\r\n' + cabecalho + b'\r\n').startswith('HTTP/1.1 400')
+    assert requisitar_bruto(porta, b'GET /' + b'a' * 70000 + b' HTTP/1.1\r\n\r\n').startswith('HTTP/1.1 400')
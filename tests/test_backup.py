@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from backup import BackupManager, ErroBackup
+from database import DatabaseManager
+from relatorios import ReportManager
+
+def dados(nome, estado="SP"):
+    return (nome, None, None, "São Paulo", estado, None, None, "1990-05-17", "Analista")
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "colaboradores.db"))
+    db.inserir_colaboradores([dados(f"Pessoa {i}") for i in range(20)])
+    return db
+
+@pytest.fixture
+def backups(db, tmp_path):
+    return BackupManager(db.db_name, str(tmp_path / "backups"), paginas_por_passo=5, pausa=0)
+
+def contar(caminho):
+    conn = sqlite3.connect(caminho)
+    total = conn.execute("SELECT COUNT(*) FROM colaboradores").fetchone()[0]
+    conn.close()
+    return total
+
+@pytest.mark.parametrize('comprimir', [False, True])
+def test_criar_e_verificar(backups, comprimir):
+    metadados = backups.criar_backup(comprimir)
+    caminho = os.path.join(backups.pasta, metadados['arquivo'])
+
+    assert metadados['arquivo'].endswith('.db.gz' if comprimir else '.db')
+    assert backups.verificar_backup(caminho)['sha256'] == metadados['sha256']
+    assert [b['arquivo'] for b in backups.listar_backups()] == [metadados['arquivo']]
+
+def test_verificar_rejeita_hash_alterado(backups):
+    caminho = os.path.join(backups.pasta, backups.criar_backup()['arquivo'])
+
+    # Altera um byte no meio do arquivo
+    with open(caminho, 'r+b') as arq:
+        arq.seek(os.path.getsize(caminho) // 2)
+        byte = arq.read(1)
+        arq.seek(-1, os.SEEK_CUR)
+        arq.write(bytes([byte[0] ^ 0xFF]))
+
+    with pytest.raises(ErroBackup, match="Hash"):
+        backups.verificar_backup(caminho)
+    with pytest.raises(ErroBackup):
+        backups.restaurar_backup(caminho)
+
+def test_verificar_rejeita_arquivo_ilegivel(backups):
+    caminho = os.path.join(backups.pasta, backups.criar_backup(comprimir=True)['arquivo'])
+    os.remove(caminho + ".json")
+    with open(caminho, 'wb') as arq:
+        arq.write(b'nao e um backup')
+
+    with pytest.raises(ErroBackup, match="ilegível"):
+        backups.verificar_backup(caminho)
+
+def test_backup_com_gravacoes_concorrentes(db, backups):
+    db.inserir_colaboradores([dados(f"Extra {i}" * 20) for i in range(2000)])
+    antes = db.contar_colaboradores()
+    parar = threading.Event()
+    gravados = []
+
+    def gravar():
+        while not parar.is_set():
+            gravados.append(db.inserir_colaborador(dados("Concorrente")))
+
+    thread = threading.Thread(target=gravar)
+    thread.start()
+    try:
+        backups.pausa = 0.001
+        metadados = backups.criar_backup()
+    finally:
+        parar.set()
+        thread.join()
+
+    caminho = os.path.join(backups.pasta, metadados['arquivo'])
+    assert gravados
+    assert metadados['passos'] > 1
+    # A cópia lê um snapshot fixo: não recomeça com as gravações
+    assert metadados['reinicios'] == 0
+    backups.verificar_backup(caminho)
+    assert antes <= contar(caminho) <= db.contar_colaboradores()
+
+def test_restaurar_mantem_versao_crescente_e_troca_identidade(db, backups):
+    relatorio = ReportManager(db)
+    relatorio.carregar_snapshot()
+    identidade_backup = db.obter_identidade()
+    caminho = os.path.join(backups.pasta, backups.criar_backup()['arquivo'])
+
+    db.inserir_colaboradores([dados(f"Depois {i}", "MG") for i in range(5)])
+    db.excluir_colaborador(1)
+    relatorio.carregar_snapshot()
+    versao_antes = db.obter_versao_dados()
+
+    resultado = backups.restaurar_backup(caminho)
+
+    assert resultado['backup_seguranca'] is not None
+    assert db.contar_colaboradores() == 20
+    assert db.obter_versao_dados() > versao_antes
+    assert db.obter_identidade() != identidade_backup
+    assert not os.path.exists(relatorio.snapshot_path)
+
+    # Alterações posteriores continuam aumentando a versão, e os relatórios seguem a tabela
+    versao_restaurada = db.obter_versao_dados()
+    db.inserir_colaborador(dados("Nova", "RJ"))
+    assert db.obter_versao_dados() > versao_restaurada
+
+    _, df = relatorio.carregar_snapshot()
+    assert sorted(df['id']) == sorted(db.listar_colaboradores()['id'])
+    assert set(df['estado']) == {"SP", "RJ"}
+
+def test_restaurar_duas_vezes_o_mesmo_backup(db, backups):
+    caminho = os.path.join(backups.pasta, backups.criar_backup()['arquivo'])
+
+    backups.restaurar_backup(caminho, backup_seguranca=False)
+    primeira = (db.obter_identidade(), db.obter_versao_dados())
+    backups.restaurar_backup(caminho, backup_seguranca=False)
+    segunda = (db.obter_identidade(), db.obter_versao_dados())
+
+    assert segunda[0] != primeira[0]
+    assert segunda[1] > primeira[1]
@@ -0,0 +1,50 @@
+from datetime import date
+
+import pytest
+
+from database import DatabaseManager
+
+def dados(nome, nascimento):
+    return (nome, None, None, "São Paulo", "SP", None, None, nascimento, "Analista")
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "colaboradores.db"))
+    db.inserir_colaboradores([
+        dados("Ana", "1990-12-25"),
+        dados("Bruno", "1985-01-05"),
+        dados("Carla", "1992-12-10"),
+        dados("Diego", "1988-01-20"),
+        dados("Elisa", "1996-02-29"),
+        dados("Fábio", "1991-02-28"),
+        dados("Gabi", "1993-03-01"),
+    ])
+    return db
+
+def nomes(df):
+    return list(df['nome_completo'])
+
+def test_aniversariantes_na_virada_do_ano(db):
+    df = db.listar_aniversariantes(date(2025, 12, 20), date(2026, 1, 10))
+    # Dezembro antes de janeiro
+    assert nomes(df) == ["Ana", "Bruno"]
+
+def test_aniversariantes_no_mesmo_mes(db):
+    assert nomes(db.listar_aniversariantes(date(2026, 1, 1), date(2026, 1, 31))) == ["Bruno", "Diego"]
+
+@pytest.mark.parametrize('inicio, fim, esperado', [
+    # Ano não bissexto: 29/02 é lembrado em 28/02
+    (date(2026, 2, 28), date(2026, 2, 28), ["Fábio", "Elisa"]),
+    (date(2026, 2, 20), date(2026, 2, 28), ["Fábio", "Elisa"]),
+    (date(2025, 12, 20), date(2026, 2, 28), ["Ana", "Bruno", "Diego", "Fábio", "Elisa"]),
+    (date(2026, 3, 1), date(2026, 3, 5), ["Gabi"]),
+    # Ano bissexto: cada um no seu dia
+    (date(2028, 2, 28), date(2028, 2, 28), ["Fábio"]),
+    (date(2028, 2, 29), date(2028, 2, 29), ["Elisa"]),
+    (date(2028, 2, 28), date(2028, 3, 1), ["Fábio", "Elisa", "Gabi"]),
+])
+def test_aniversariantes_em_29_de_fevereiro(db, inicio, fim, esperado):
+    assert nomes(db.listar_aniversariantes(inicio, fim)) == esperado
+
+def test_periodo_de_um_ano_ou_mais(db):
+    assert len(db.listar_aniversariantes(date(2026, 6, 1), date(2027, 6, 1))) == 7
@@ -0,0 +1,116 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from manutencao import MaintenanceManager, ManutencaoEmExecucao
+
+def dados(i):
+    return (f"Pessoa {i}", None, None, "São Paulo", "SP", None, None, f"19{i % 90 + 10:02d}-0{i % 9 + 1}-1{i % 9}", "Analista")
+
+@pytest.fixture
+def manutencao(tmp_path):
+    manutencao = MaintenanceManager(str(tmp_path / "colaboradores.db"))
+    yield manutencao
+    manutencao.parar_agendamento()
+
+def estatisticas(manutencao):
+    conn = sqlite3.connect(manutencao.db_name)
+    stat = conn.execute(
+        "SELECT idx, stat FROM sqlite_stat1 WHERE tbl = 'colaboradores' ORDER BY idx"
+    ).fetchall()
+    conn.close()
+    return stat
+
+def test_estatisticas_acompanham_o_tamanho_da_tabela(manutencao):
+    manutencao.db.inserir_colaboradores([dados(i) for i in range(100)])
+    execucao = manutencao.executar_manutencao()
+    inicial = estatisticas(manutencao)
+    assert inicial and "colaboradores" in execucao['mensagens'][0]
+
+    # Sem variação relevante, nada é reanalisado
+    manutencao.db.inserir_colaboradores([dados(i) for i in range(5)])
+    assert 'colaboradores' not in manutencao.tabelas_desatualizadas()
+    manutencao.executar_manutencao()
+    assert estatisticas(manutencao) == inicial
+
+    manutencao.db.inserir_colaboradores([dados(i) for i in range(50000)])
+    assert 'colaboradores' in manutencao.tabelas_desatualizadas()
+    manutencao.executar_manutencao()
+    crescida = estatisticas(manutencao)
+    assert crescida != inicial
+
+    conn = sqlite3.connect(manutencao.db_name)
+    conn.execute("DELETE FROM colaboradores WHERE id % 10 != 0")
+    conn.commit()
+    conn.close()
+    manutencao.executar_manutencao()
+    assert estatisticas(manutencao) != crescida
+    assert manutencao.tabelas_desatualizadas() == {}
+
+def test_sem_sqlite_stat1_reanalisa_tudo(manutencao):
+    manutencao.db.inserir_colaboradores([dados(i) for i in range(10)])
+    manutencao.executar_manutencao()
+
+    conn = sqlite3.connect(manutencao.db_name)
+    conn.execute("DROP TABLE sqlite_stat1")
+    conn.commit()
+    conn.close()
+
+    assert 'colaboradores' in manutencao.tabelas_desatualizadas()
+    manutencao.executar_manutencao()
+    assert estatisticas(manutencao)
+
+def test_execucoes_simultaneas(manutencao, monkeypatch):
+    liberar = threading.Event()
+    original = manutencao._executar_manutencao
+
+    def lenta(verificacao_completa):
+        liberar.wait(5)
+        return original(verificacao_completa)
+
+    monkeypatch.setattr(manutencao, '_executar_manutencao', lenta)
+    thread = threading.Thread(target=manutencao.executar_manutencao)
+    thread.start()
+    while not manutencao.em_execucao():
+        time.sleep(0.01)
+
+    # Outra instância sobre o mesmo banco também é barrada
+    with pytest.raises(ManutencaoEmExecucao):
+        MaintenanceManager(manutencao.db_name).executar_manutencao()
+
+    liberar.set()
+    thread.join()
+    assert not manutencao.em_execucao()
+    assert len(manutencao.listar_historico()) == 1
+
+def test_falha_agendada_fica_registrada(manutencao, monkeypatch):
+    def falhar(verificacao_completa=False):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(manutencao, '_deve_executar', lambda agora, ocioso_desde: True)
+    monkeypatch.setattr(manutencao, 'executar_manutencao', falhar)
+    manutencao.iniciar_agendamento(intervalo_verificacao=0.01)
+
+    limite = time.monotonic() + 5
+    while manutencao.ultimo_erro() is None and time.monotonic() < limite:
+        time.sleep(0.01)
+    manutencao.parar_agendamento()
+
+    # Visível também para outras instâncias, como a da página de administração
+    quando, mensagem = MaintenanceManager(manutencao.db_name).ultimo_erro()
+    assert mensagem == "disk I/O error"
+    assert isinstance(quando, datetime)
+
+@pytest.mark.parametrize('janela, hora, esperado', [
+    ((2, 5), 3, True),
+    ((2, 5), 5, False),
+    ((22, 4), 23, True),
+    ((22, 4), 1, True),
+    ((22, 4), 12, False),
+])
+def test_janela_de_baixo_uso(manutencao, janela, hora, esperado):
+    manutencao.janela = janela
+    assert manutencao.em_janela(datetime(2026, 1, 1, hora)) is esperado
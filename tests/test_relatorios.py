@@ -0,0 +1,169 @@
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import relatorios
+from database import DatabaseManager
+from relatorios import ReportManager
+
+def dados(nome, estado="SP", cargo="Analista"):
+    return (nome, None, None, "São Paulo", estado, None, None, "1990-05-17", cargo)
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "colaboradores.db"))
+    db.inserir_colaboradores([dados(f"Pessoa {i}") for i in range(10)])
+    return db
+
+def arquivos(relatorio):
+    return sorted(os.listdir(relatorio.snapshot_path))
+
+def conferir(relatorio):
+    """O snapshot carregado deve ser igual à tabela do SQLite"""
+    _, df = relatorio.carregar_snapshot()
+    tabela = relatorio.db.listar_colaboradores().sort_values('id', ignore_index=True)
+    assert list(df['id']) == list(tabela['id'])
+    assert list(df['estado']) == list(tabela['estado'])
+    assert list(df['cargo']) == list(tabela['cargo'])
+    return df
+
+def test_snapshot_inicial(db):
+    relatorio = ReportManager(db)
+    conferir(relatorio)
+    assert arquivos(relatorio) == [f"base-{db.obter_versao_dados():020d}.parquet"]
+
+@pytest.mark.parametrize('recarregar', [False, True])
+def test_deltas_de_insercao_atualizacao_e_exclusao(db, recarregar):
+    relatorio = ReportManager(db)
+    conferir(relatorio)
+
+    db.inserir_colaborador(dados("Nova", "MG"))
+    conferir(relatorio)
+    db.atualizar_colaborador(3, dados("Pessoa 2", "RJ", "Gerente"))
+    conferir(relatorio)
+    db.excluir_colaborador(5)
+    db.atualizar_colaborador(7, dados("Pessoa 6", "BA"))
+    db.excluir_colaborador(7)
+
+    if recarregar:
+        # Sem o cache em memória, a base e os deltas são lidos do disco
+        relatorios._cache.clear()
+    df = conferir(relatorio)
+
+    assert 5 not in set(df['id']) and 7 not in set(df['id'])
+    assert df.loc[df['id'] == 3, 'cargo'].item() == "Gerente"
+    assert len([nome for nome in arquivos(relatorio) if nome.startswith('delta-')]) == 3
+    # O registro de alterações já processado é limpo
+    assert db.obter_alteracoes_desde(db.obter_versao_dados())[2] == set()
+
+def test_delta_guarda_apenas_as_alteracoes(db):
+    relatorio = ReportManager(db)
+    conferir(relatorio)
+
+    db.inserir_colaborador(dados("Nova"))
+    db.excluir_colaborador(1)
+    relatorio.atualizar_snapshot()
+
+    delta = os.path.join(relatorio.snapshot_path, arquivos(relatorio)[-1])
+    df = pd.read_parquet(delta)
+    assert sorted(zip(df['id'], df['excluido'])) == [(1, True), (11, False)]
+
+def test_compactacao(db, monkeypatch):
+    monkeypatch.setattr(relatorios, 'MAXIMO_DELTAS', 3)
+    relatorio = ReportManager(db)
+    conferir(relatorio)
+
+    for i in range(4):
+        db.inserir_colaborador(dados(f"Nova {i}"))
+        relatorio.atualizar_snapshot()
+    conferir(relatorio)
+
+    assert arquivos(relatorio) == [f"base-{db.obter_versao_dados():020d}.parquet"]
+    relatorios._cache.clear()
+    conferir(relatorio)
+
+def test_lacuna_no_registro_reconstroi(db):
+    relatorio = ReportManager(db)
+    conferir(relatorio)
+
+    db.inserir_colaborador(dados("Nova", "MG"))
+    db.excluir_colaborador(2)
+    # Outro processo já processou e limpou as alterações posteriores ao snapshot
+    db.limpar_alteracoes(db.obter_versao_dados() - 1)
+    db.atualizar_colaborador(4, dados("Pessoa 3", "RJ"))
+
+    conferir(relatorio)
+    assert arquivos(relatorio) == [f"base-{db.obter_versao_dados():020d}.parquet"]
+
+def test_registro_vazio_com_versao_maior_reconstroi(db):
+    relatorio = ReportManager(db)
+    conferir(relatorio)
+
+    db.excluir_colaborador(2)
+    db.limpar_alteracoes(db.obter_versao_dados())
+
+    df = conferir(relatorio)
+    assert 2 not in set(df['id'])
+
+def test_identidade_diferente_reconstroi(db, tmp_path):
+    relatorio = ReportManager(db)
+    conferir(relatorio)
+
+    # Outro banco com a mesma versão dos dados apontando para o mesmo snapshot
+    outro = DatabaseManager(str(tmp_path / "outro.db"))
+    outro.inserir_colaboradores([dados(f"Outra {i}", "PR") for i in range(10)])
+    assert outro.obter_versao_dados() == db.obter_versao_dados()
+
+    df = conferir(ReportManager(outro, relatorio.snapshot_path))
+    assert set(df['estado']) == {"PR"}
+
+    df = conferir(relatorio)
+    assert set(df['estado']) == {"SP"}
+
+def test_cache_distingue_identidade_com_a_mesma_versao(db):
+    relatorio = ReportManager(db)
+    geracao, _ = relatorio.carregar_snapshot()
+
+    # Simula uma restauração que repete a versão com outros dados
+    conn = sqlite3.connect(db.db_name)
+    conn.execute("DROP TRIGGER trg_colaboradores_update")
+    conn.execute("UPDATE colaboradores SET estado = 'AM'")
+    conn.execute("UPDATE sistema SET valor = 'restaurado' WHERE chave = 'identidade'")
+    conn.commit()
+    conn.close()
+
+    nova_geracao, df = relatorio.carregar_snapshot()
+    assert nova_geracao[2] == geracao[2]
+    assert nova_geracao != geracao
+    assert set(df['estado']) == {"AM"}
+
+def test_versao_que_volta_reconstroi(db):
+    relatorio = ReportManager(db)
+    conferir(relatorio)
+    versao = db.obter_versao_dados()
+
+    conn = sqlite3.connect(db.db_name)
+    conn.execute("DROP TRIGGER trg_colaboradores_delete")
+    conn.execute("DELETE FROM colaboradores WHERE id > 5")
+    conn.execute("UPDATE sqlite_sequence SET seq = 3 WHERE name = 'colaboradores_alteracoes'")
+    conn.commit()
+    conn.close()
+
+    df = conferir(relatorio)
+    assert len(df) == 5
+    assert db.obter_versao_dados() < versao
+    assert arquivos(relatorio) == ["base-00000000000000000003.parquet"]
+
+def test_relatorios(db):
+    db.inserir_colaborador(dados("Gerente", "MG", "Gerente"))
+    relatorio = ReportManager(db)
+
+    cruzada = relatorio.cargo_por_estado()
+    assert cruzada.loc['Analista', 'SP'] == 10
+    assert cruzada.loc['Gerente', 'MG'] == 1
+    assert cruzada.loc['Total', 'Total'] == 11
+
+    db.excluir_colaborador(1)
+    assert relatorio.cargo_por_estado().loc['Total', 'Total'] == 10